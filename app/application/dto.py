@@ -1,31 +1,30 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable
 
 from app.domain.models import FormatChoice, Platform
 
 
-@dataclass(frozen=True, slots=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class ParsedLinkDTO:
     url: str
     platform: Platform
 
 
-@dataclass(frozen=True, slots=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class FormatListDTO:
     platform: Platform
-    choices: list[FormatChoice]
+    choices: tuple[FormatChoice, ...]
     session_version: int
 
 
-@dataclass(frozen=True, slots=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class EnqueueResultDTO:
     accepted: bool
     message: str
 
 
-@dataclass(frozen=True, slots=True)
+@dataclass(frozen=True, slots=True, kw_only=True)
 class CancelResultDTO:
     cancelled: bool
     message: str
\ No newline at end of file
@@ -18,6 +18,7 @@ class StatusAnimatorPort(Protocol):
     def attach(self, *, chat_id: int, message_id: int) -> StatusHandle: ...
 
     async def set_text(self, handle: StatusHandle, text: str, *, reply_markup: Any | None = None) -> None: ...
+    def set_next_nowait(self, handle: StatusHandle, text: str) -> None: ...
     async def start_loop(self, handle: StatusHandle, *, frames: Sequence[str]) -> None: ...
     async def stop_loop(self, handle: StatusHandle) -> None: ...
     async def finish(self, handle: StatusHandle, *, text: str) -> None: ...
@@ -2,31 +2,98 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict
 
 from app.domain.models import Job, JobId, Container
 from app.infrastructure.active_jobs import ActiveJobsRegistry
 from app.infrastructure.temp_storage import TempStorage
 from app.infrastructure.telegram_sender import TelegramSender, TelegramSenderError
-from app.application.ports.status_animator import StatusAnimatorPort
+from app.application.ports.status_animator import StatusAnimatorPort, StatusHandle
 from app.constants import (
-    UX_MINE_ENTER,
     UX_MINE_DOWNLOAD_FRAMES,
     UX_MINE_PROBE,
     UX_MINE_CLEAN,
     UX_MINE_UPLOAD_FRAMES,
     UX_MINE_DONE,
-    UX_MINE_CANCELLED,
     UX_MINE_SEND_FAILED,
+    UX_MINE_SENT_UNVERIFIED,
     UX_MINE_TRY_LATER,
 )
 from app.infrastructure.yt import YdlClient, YdlError
-from app.infrastructure.ffmpeg import FfmpegMerger, FfmpegError, FfprobeClient, FfprobeError
+from app.infrastructure.ffmpeg import FfmpegMerger, FfmpegError, FfprobeClient, FfprobeError, ProbeResult
 from app.infrastructure.ffmpeg.ffmpeg import MergeInputs
 from app.domain.errors import JobCancelledError
 
 
+logger = logging.getLogger("download_service")
+
+# Leading magic bytes of each target container: MP4 has "ftyp" at offset 4, Matroska starts with EBML.
+_CONTAINER_MAGIC: dict[Container, tuple[int, bytes]] = {
+    Container.MP4: (4, b"ftyp"),
+    Container.MKV: (0, b"\x1a\x45\xdf\xa3"),
+}
+
+# Acceptance text stays on screen this long before the download animation starts.
+_UX_INTRO_PAUSE_SEC = 1.5
+
+# Files at least this big take far longer to upload than to ffprobe, so the two are overlapped.
+_PROBE_OVERLAP_FROM_BYTES = 50 * 1024 * 1024
+
+
+def _header_matches(path: Path, container: Container) -> bool:
+    magic = _CONTAINER_MAGIC.get(container)
+    if magic is None:
+        return True
+    offset, sig = magic
+    try:
+        with open(path, "rb") as f:
+            head = f.read(offset + len(sig))
+    except OSError:
+        return False
+    return head[offset:] == sig
+
+
+def _local_checks(
+    hard_limit_bytes: int,
+    *,
+    output_path: Path,
+    expected_ext: str,
+    container: Container,
+) -> int:
+    """Filesystem-only pre-send checks. Returns file size in bytes."""
+    # exists (single stat syscall for existence + size)
+    try:
+        st = os.stat(output_path)
+    except FileNotFoundError as exc:
+        raise TelegramSenderError("Файл не найден перед отправкой.") from exc
+    # size > 0
+    size = st.st_size
+    if size <= 0:
+        raise TelegramSenderError("Файл пустой.")
+    # size <= hard limit
+    if size > hard_limit_bytes:
+        raise TelegramSenderError("Файл превышает лимит Telegram для ботов (≈2ГБ).")
+    # expected container by extension
+    if os.path.splitext(os.fspath(output_path))[1].lower() != expected_ext:
+        raise TelegramSenderError("Неожиданный контейнер файла.")
+    # container header sniff: rejects a wrong muxer output without spawning ffprobe
+    if not _header_matches(output_path, container):
+        raise TelegramSenderError(f"Контейнер файла не соответствует ожидаемому ({container.value}).")
+    return size
+
+
+def _probe_checks(*, probe: ProbeResult) -> None:
+    # container is already verified by _local_checks header sniff
+    # streams exist
+    if not probe.has_video or not probe.has_audio:
+        raise TelegramSenderError("Файл повреждён (нет видео/аудио).")
+    # duration sanity
+    if probe.duration_sec is not None and probe.duration_sec <= 0:
+        raise TelegramSenderError("Файл повреждён (длительность 0).")
+
+
 class DownloadService:
     """
     Orchestrates media pipeline for a queued job:
@@ -57,7 +124,6 @@ class DownloadService:
         self._anim = status_animator
         self._active = active_jobs
         self._tg_hard_limit_bytes = tg_hard_limit_bytes
-        self._logger = logging.getLogger("download_service")
         self._cancel_tokens: Dict[JobId, asyncio.Event] = {}
         self._active_job_by_user: Dict[int, JobId] = {}
 
@@ -68,14 +134,11 @@ class DownloadService:
             self._active_job_by_user[user_id] = job_id
 
     def cancel_by_user(self, user_id: int) -> bool:
-        job_id = self._active_job_by_user.get(user_id)
+        # Pop unconditionally: a mapping whose token is already gone is stale anyway.
+        job_id = self._active_job_by_user.pop(user_id, None)
         if job_id is None:
             return False
-        cancelled = self.cancel(job_id)
-        if cancelled:
-            # best-effort cleanup of mapping
-            self._active_job_by_user.pop(user_id, None)
-        return cancelled
+        return self.cancel(job_id)
 
     def cancel(self, job_id: JobId) -> bool:
         """Cancel a queued/running job.
@@ -89,138 +152,239 @@ class DownloadService:
         token.set()
         return True
 
+    async def _start_loop_after(self, handle: StatusHandle, *, delay_sec: float, frames: tuple[str, ...]) -> None:
+        await asyncio.sleep(delay_sec)
+        await self._anim.start_loop(handle, frames=frames)
+
     @staticmethod
     def _raise_if_cancelled(cancel_event: asyncio.Event) -> None:
         if cancel_event.is_set():
             raise JobCancelledError()
 
     async def handle_job(self, job: Job, cancel_event: asyncio.Event) -> None:
-        chat_id = int(job.chat_id)
-        handle = self._anim.attach(chat_id=chat_id, message_id=int(job.status_message_id))
+        # ChatId/UserId are NewTypes over int: no cast needed.
+        chat_id = job.chat_id
+        user_id = job.user_id
+        job_id = job.job_id
+        job_id_str = str(job_id)
+        choice = job.choice
+        url = job.url
+        ext = choice.ext
+        container = choice.container
+        video_fmt_id = choice.video.fmt.extractor_format_id
+        audio_fmt_id = choice.audio.fmt.extractor_format_id
+        status_message_id = job.status_message_id
+        if status_message_id is None:
+            # Progress and results are reported by editing the status message: without one
+            # the job has nowhere to report to, so drop it and free the per-user slot.
+            logger.error("job without status message, dropped: %s", job_id)
+            self._cancel_tokens.pop(job_id, None)
+            self._active.release(user_id)
+            return
+        handle = self._anim.attach(chat_id=chat_id, message_id=status_message_id)
 
         # Allow `/cancel` by user_id even if token registration happened without user_id.
-        self._active_job_by_user[int(job.user_id)] = job.job_id
-        self._cancel_tokens.setdefault(job.job_id, cancel_event)
-
-        # UX: pause after acceptance before starting the mining loop.
-        await asyncio.sleep(1.5)
-        await self._anim.start_loop(handle, frames=UX_MINE_DOWNLOAD_FRAMES)
+        self._active_job_by_user[user_id] = job_id
+        self._cancel_tokens.setdefault(job_id, cancel_event)
 
         workdir: Path | None = None
         try:
+            # Single guard for jobs cancelled while queued; afterwards the ydl/ffmpeg/ffprobe
+            # clients watch cancel_event themselves and raise JobCancelledError mid-operation.
             self._raise_if_cancelled(cancel_event)
 
-            workdir = self._temp.allocate(str(job.job_id))
-
-            video_fmt_id = job.choice.video.fmt.extractor_format_id
-            audio_fmt_id = job.choice.audio.fmt.extractor_format_id
-
-            if video_fmt_id == audio_fmt_id:
-                # Muxed/progressive stream (video+audio in a single file). Common for RuTube.
-                muxed_file = await self._ydl.download_stream(
-                    url=job.url,
-                    extractor_format_id=video_fmt_id,
-                    out_path=workdir / "muxed.stream",
-                    cancel_event=cancel_event,
-                )
-                self._raise_if_cancelled(cancel_event)
+            # UX: keep the acceptance text up briefly before the mining loop, but download meanwhile.
+            intro_task = asyncio.create_task(
+                self._start_loop_after(handle, delay_sec=_UX_INTRO_PAUSE_SEC, frames=UX_MINE_DOWNLOAD_FRAMES)
+            )
+            try:
+                workdir = self._temp.allocate(job_id_str)
+                wd = os.fspath(workdir)
 
-                v_file = muxed_file
-                a_file = muxed_file
-            else:
-                v_file = await self._ydl.download_stream(
-                    url=job.url,
-                    extractor_format_id=video_fmt_id,
-                    out_path=workdir / "video.stream",
-                    cancel_event=cancel_event,
-                )
-                self._raise_if_cancelled(cancel_event)
-
-                a_file = await self._ydl.download_stream(
-                    url=job.url,
-                    extractor_format_id=audio_fmt_id,
-                    out_path=workdir / "audio.stream",
-                    cancel_event=cancel_event,
-                )
-                self._raise_if_cancelled(cancel_event)
+                if video_fmt_id == audio_fmt_id:
+                    v_file, a_file = await self._handle_muxed_download(
+                        url=url, fmt_id=video_fmt_id, workdir=wd, cancel_event=cancel_event
+                    )
+                else:
+                    v_file, a_file = await self._handle_split_download(
+                        url=url,
+                        video_fmt_id=video_fmt_id,
+                        audio_fmt_id=audio_fmt_id,
+                        workdir=wd,
+                        cancel_event=cancel_event,
+                    )
+            finally:
+                # Downloads are over: a still-pending intro must not start the loop after this point.
+                intro_task.cancel()
+                await asyncio.gather(intro_task, return_exceptions=True)
 
             await self._anim.stop_loop(handle)
-            await self._anim.set_text(handle, UX_MINE_CLEAN)
-            out_path = workdir / f"output.{job.choice.ext}"
+            self._anim.set_next_nowait(handle, UX_MINE_CLEAN)
+            out_path = workdir / f"output.{ext}"
             merged = await self._ffmpeg.merge(
                 MergeInputs(
                     video_path=v_file,
                     audio_path=a_file,
                     output_path=out_path,
-                    container=job.choice.container,
+                    container=container,
                 ),
                 cancel_event=cancel_event,
             )
+            # Free the source streams now instead of holding them through the upload.
+            for p in {v_file, a_file} - {merged}:
+                try:
+                    os.unlink(p)
+                except OSError:
+                    pass
 
-            await self._anim.set_text(handle, UX_MINE_PROBE)
-            probe = await self._ffprobe.probe(merged, cancel_event=cancel_event)
-
-            self._pre_send_checks(job=job, output_path=merged, probe=probe)
-
-            await self._anim.start_loop(handle, frames=UX_MINE_UPLOAD_FRAMES)
-            await self._sender.send_media_best_effort(chat_id, merged)
+            # stat + header read are blocking file I/O: keep them off the event loop.
+            size = await asyncio.to_thread(
+                _local_checks,
+                self._tg_hard_limit_bytes,
+                output_path=merged,
+                expected_ext=f".{ext}",
+                container=container,
+            )
+            rejected_after_send = await self._probe_and_send(
+                handle=handle,
+                chat_id=chat_id,
+                path=merged,
+                size=size,
+                cancel_event=cancel_event,
+            )
 
             await self._anim.stop_loop(handle)
-            await self._anim.finish(handle, text=UX_MINE_DONE)
+            if rejected_after_send is None:
+                await self._anim.finish(handle, text=UX_MINE_DONE)
+            else:
+                await self._anim.finish(handle, text=UX_MINE_SENT_UNVERIFIED.format(reason=rejected_after_send))
 
         except JobCancelledError:
+            # Expected flow: no traceback.
+            logger.debug("job cancelled: %s", job_id)
             await self._anim.stop_loop(handle)
             # удаляем статус-сообщение, а не заменяем текстом
             await self._sender.delete_status(chat_id=handle.chat_id, message_id=handle.message_id)
         except (YdlError, FfmpegError, FfprobeError):
-            self._logger.exception("job failed: %s", job.job_id)
+            logger.exception("job failed: %s", job_id)
             await self._anim.stop_loop(handle)
             await self._anim.fail(handle, text=UX_MINE_TRY_LATER)
         except TelegramSenderError as exc:
-            self._logger.exception("job failed: %s", job.job_id)
+            logger.exception("job failed: %s", job_id)
             await self._anim.stop_loop(handle)
             await self._anim.fail(handle, text=f"{UX_MINE_SEND_FAILED}\n\nПричина: {exc}")
         except Exception:
-            self._logger.exception("job failed: %s", job.job_id)
+            logger.exception("job failed: %s", job_id)
             await self._anim.stop_loop(handle)
             await self._anim.fail(handle, text=UX_MINE_TRY_LATER)
         finally:
             # Always release per-user active job slot
-            self._active.release(int(job.user_id))
-            self._cancel_tokens.pop(job.job_id, None)
+            self._active.release(user_id)
+            self._cancel_tokens.pop(job_id, None)
             # Drop per-user mapping for this job if present
-            uid = int(job.user_id)
-            if self._active_job_by_user.get(uid) == job.job_id:
-                self._active_job_by_user.pop(uid, None)
+            prev = self._active_job_by_user.pop(user_id, None)
+            if prev is not None and prev != job_id:
+                # Mapping already points at a newer job of this user: put it back.
+                self._active_job_by_user[user_id] = prev
             if workdir is not None:
-                self._temp.cleanup(str(job.job_id))
-
-    def _pre_send_checks(self, *, job: Job, output_path: Path, probe) -> None:
-        # exists
-        if not output_path.exists():
-            raise TelegramSenderError("Файл не найден перед отправкой.")
-        # size > 0
-        size = output_path.stat().st_size
-        if size <= 0:
-            raise TelegramSenderError("Файл пустой.")
-        # size <= hard limit
-        if size > self._tg_hard_limit_bytes:
-            raise TelegramSenderError("Файл превышает лимит Telegram для ботов (≈2ГБ).")
-        # expected container by extension + ffprobe format
-        expected_ext = f".{job.choice.ext}"
-        if output_path.suffix.lower() != expected_ext:
-            raise TelegramSenderError("Неожиданный контейнер файла.")
-        if probe.format_name is not None:
-            fmt = probe.format_name.lower()
-            if job.choice.container == Container.MP4:
-                if "mp4" not in fmt and "mov" not in fmt:
-                    raise TelegramSenderError("Контейнер файла не соответствует ожидаемому (mp4).")
-            if job.choice.container == Container.MKV:
-                if "matroska" not in fmt and "mkv" not in fmt:
-                    raise TelegramSenderError("Контейнер файла не соответствует ожидаемому (mkv).")
-        # streams exist
-        if not probe.has_video or not probe.has_audio:
-            raise TelegramSenderError("Файл повреждён (нет видео/аудио).")
-        # duration sanity
-        if probe.duration_sec is not None and probe.duration_sec <= 0:
-            raise TelegramSenderError("Файл повреждён (длительность 0).")
+                self._temp.cleanup(job_id_str)
+
+    async def _handle_muxed_download(
+        self,
+        *,
+        url: str,
+        fmt_id: str,
+        workdir: str,
+        cancel_event: asyncio.Event,
+    ) -> tuple[Path, Path]:
+        # Muxed/progressive stream (video+audio in a single file). Common for RuTube.
+        muxed_file = await self._ydl.download_stream(
+            url=url,
+            extractor_format_id=fmt_id,
+            out_path=os.path.join(workdir, "muxed.stream"),
+            cancel_event=cancel_event,
+        )
+        return muxed_file, muxed_file
+
+    async def _handle_split_download(
+        self,
+        *,
+        url: str,
+        video_fmt_id: str,
+        audio_fmt_id: str,
+        workdir: str,
+        cancel_event: asyncio.Event,
+    ) -> tuple[Path, Path]:
+        # Video and audio are independent network fetches: download them concurrently.
+        v_task = asyncio.create_task(
+            self._ydl.download_stream(
+                url=url,
+                extractor_format_id=video_fmt_id,
+                out_path=os.path.join(workdir, "video.stream"),
+                cancel_event=cancel_event,
+            )
+        )
+        a_task = asyncio.create_task(
+            self._ydl.download_stream(
+                url=url,
+                extractor_format_id=audio_fmt_id,
+                out_path=os.path.join(workdir, "audio.stream"),
+                cancel_event=cancel_event,
+            )
+        )
+        try:
+            v_file, a_file = await asyncio.gather(v_task, a_task)
+        except BaseException:
+            # One stream failed (or job was cancelled): stop the sibling, never leak it.
+            v_task.cancel()
+            a_task.cancel()
+            await asyncio.gather(v_task, a_task, return_exceptions=True)
+            raise
+        return v_file, a_file
+
+    async def _probe_and_send(
+        self,
+        *,
+        handle: StatusHandle,
+        chat_id: int,
+        path: Path,
+        size: int,
+        cancel_event: asyncio.Event,
+    ) -> str | None:
+        """
+        Validate with ffprobe and upload. Returns None when a validated file was sent.
+
+        Big files are uploaded while ffprobe runs; only the cheap local checks (stat, extension,
+        header sniff) gate the upload start. If ffprobe rejects the file after the upload has
+        already finished, the file cannot be recalled: the rejection reason is returned so the
+        caller reports a delivered-but-unverified file instead of a send failure.
+        """
+        if size < _PROBE_OVERLAP_FROM_BYTES:
+            # Small file: the upload may finish before ffprobe, so validate first.
+            self._anim.set_next_nowait(handle, UX_MINE_PROBE)
+            probe = await self._ffprobe.probe(path, cancel_event=cancel_event)
+            _probe_checks(probe=probe)
+            await self._anim.start_loop(handle, frames=UX_MINE_UPLOAD_FRAMES)
+            await self._sender.send_media_best_effort(chat_id, path)
+            return None
+
+        # Big file: start the upload right away and abort it if ffprobe rejects the file.
+        await self._anim.start_loop(handle, frames=UX_MINE_UPLOAD_FRAMES)
+        send_task = asyncio.create_task(self._sender.send_media_best_effort(chat_id, path))
+        try:
+            probe = await self._ffprobe.probe(path, cancel_event=cancel_event)
+            _probe_checks(probe=probe)
+        except Exception as exc:
+            send_task.cancel()
+            await asyncio.gather(send_task, return_exceptions=True)
+            if send_task.cancelled() or send_task.exception() is not None:
+                raise
+            # The upload won the race: the file is already in the chat.
+            logger.warning("file delivered before ffprobe rejected it: %s", path, exc_info=True)
+            return str(exc) if isinstance(exc, TelegramSenderError) else "ffprobe не смог прочитать файл."
+        except BaseException:
+            send_task.cancel()
+            await asyncio.gather(send_task, return_exceptions=True)
+            raise
+        await send_task
+        return None
@@ -5,6 +5,9 @@ from app.application.services import DownloadService
 from app.domain.models import JobId
 from app.constants import UX_MINE_CANCELLED, UX_MINE_CANCEL_NOTHING
 
+_CANCEL_OK = CancelResultDTO(cancelled=True, message=UX_MINE_CANCELLED)
+_CANCEL_NOTHING = CancelResultDTO(cancelled=False, message=UX_MINE_CANCEL_NOTHING)
+
 
 class CancelDownloadUseCase:
     def __init__(self, *, downloads: DownloadService) -> None:
@@ -16,6 +19,4 @@ class CancelDownloadUseCase:
         else:
             cancelled = self._downloads.cancel_by_user(user_id)
 
-        if cancelled:
-            return CancelResultDTO(cancelled=True, message=UX_MINE_CANCELLED)
-        return CancelResultDTO(cancelled=False, message=UX_MINE_CANCEL_NOTHING)
\ No newline at end of file
+        return _CANCEL_OK if cancelled else _CANCEL_NOTHING
\ No newline at end of file
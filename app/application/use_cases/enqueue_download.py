@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import uuid
-
 from app.application.dto import EnqueueResultDTO
 from app.domain.models import (
     ChoiceAvailability,
@@ -10,9 +8,9 @@ from app.domain.models import (
     JobId,
     UserId,
     ChatId,
-    Platform,
 )
 from app.infrastructure.active_jobs import ActiveJobsRegistry
+from app.infrastructure.fast_jobid import new_job_id_hex
 from app.infrastructure.session_store import SessionStore
 from app.infrastructure.download_queue import DownloadQueue
 from app.application.services import DownloadService
@@ -24,6 +22,15 @@ from app.constants import (MSG_FORMAT_RISKY_WARNING,
                        MSG_FORMAT_UNAVAILABLE,
                        )
 
+# Fixed-payload results are immutable: share one instance instead of allocating per request.
+_ENQ_ALREADY_ACTIVE = EnqueueResultDTO(accepted=False, message=MSG_ALREADY_ACTIVE_JOB)
+_ENQ_SESSION_EXPIRED = EnqueueResultDTO(accepted=False, message=MSG_SESSION_EXPIRED)
+_ENQ_CHOICE_FAILED = EnqueueResultDTO(accepted=False, message=MSG_CHOICE_PROCESS_FAILED)
+_ENQ_FORMAT_UNAVAILABLE = EnqueueResultDTO(accepted=False, message=MSG_FORMAT_UNAVAILABLE)
+_ENQ_QUEUE_BUSY = EnqueueResultDTO(accepted=False, message=MSG_QUEUE_BUSY)
+_ENQ_ACCEPTED_RISKY = EnqueueResultDTO(accepted=True, message=MSG_FORMAT_RISKY_WARNING)
+_ENQ_ACCEPTED = EnqueueResultDTO(accepted=True, message="")
+
 
 class EnqueueDownloadUseCase:
     def __init__(
@@ -39,6 +46,11 @@ class EnqueueDownloadUseCase:
         self._downloads = downloads
         self._active = active_jobs
 
+    def _fail(self, user_id: int, result: EnqueueResultDTO) -> EnqueueResultDTO:
+        # Rejected after try_acquire: give the per-user slot back.
+        self._active.release(user_id)
+        return result
+
     async def execute(
         self,
         *,
@@ -50,24 +62,19 @@ class EnqueueDownloadUseCase:
     ) -> EnqueueResultDTO:
         # per-user active limit (stability)
         if not self._active.try_acquire(user_id):
-            return EnqueueResultDTO(accepted=False, message=MSG_ALREADY_ACTIVE_JOB)
+            return _ENQ_ALREADY_ACTIVE
 
-        try:
-            choice = self._sessions.get_choice(user_id=user_id, version=session_version, choice_id=choice_id)
-            url, platform_key = self._sessions.get_session_meta(user_id=user_id, version=session_version)
-        except KeyError:
-            self._active.release(user_id)
-            return EnqueueResultDTO(accepted=False, message=MSG_SESSION_EXPIRED)
-        except Exception:
-            self._active.release(user_id)
-            return EnqueueResultDTO(accepted=False, message=MSG_CHOICE_PROCESS_FAILED)
+        # Expired session / stale button is a common miss: plain None checks, no exceptions.
+        found = self._sessions.get_for_enqueue(user_id=user_id, version=session_version, choice_id=choice_id)
+        if found is None:
+            return self._fail(user_id, _ENQ_SESSION_EXPIRED)
+        choice, url, platform = found
 
-        if choice.availability == ChoiceAvailability.UNAVAILABLE:
-            self._active.release(user_id)
-            return EnqueueResultDTO(accepted=False, message=MSG_FORMAT_UNAVAILABLE)
+        if choice.availability is ChoiceAvailability.UNAVAILABLE:
+            return self._fail(user_id, _ENQ_FORMAT_UNAVAILABLE)
 
         warned = False
-        if choice.availability == ChoiceAvailability.RISKY:
+        if choice.availability is ChoiceAvailability.RISKY:
             try:
                 if not self._sessions.warned_risky_once(user_id=user_id, version=session_version):
                     self._sessions.mark_warned_risky_once(user_id=user_id, version=session_version)
@@ -75,26 +82,26 @@ class EnqueueDownloadUseCase:
             except KeyError:
                 warned = True
 
-        job = Job(
-            job_id=JobId(uuid.uuid4().hex),
-            user_id=UserId(user_id),
-            chat_id=ChatId(chat_id),
-            status_message_id=status_message_id,
-            platform=Platform(platform_key),
-            url=url,
-            choice=choice,
-            stage=JobStage.QUEUED,
-        )
+        try:
+            job = Job(
+                job_id=JobId(new_job_id_hex()),
+                user_id=UserId(user_id),
+                chat_id=ChatId(chat_id),
+                status_message_id=status_message_id,
+                platform=platform,
+                url=url,
+                choice=choice,
+                stage=JobStage.QUEUED,
+            )
+            token = self._queue.enqueue(job)
+        except Exception:
+            return self._fail(user_id, _ENQ_CHOICE_FAILED)
 
-        token = await self._queue.enqueue(job)
         if token is None:
-            self._active.release(user_id)
-            return EnqueueResultDTO(accepted=False, message=MSG_QUEUE_BUSY)
+            return self._fail(user_id, _ENQ_QUEUE_BUSY)
 
         self._downloads.register_cancel_token(job.job_id, token)
 
         if warned:
-            return EnqueueResultDTO(
-                accepted=True,
-                message=MSG_FORMAT_RISKY_WARNING)
-        return EnqueueResultDTO(accepted=True, message="")
+            return _ENQ_ACCEPTED_RISKY
+        return _ENQ_ACCEPTED
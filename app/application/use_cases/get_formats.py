@@ -20,39 +20,32 @@ class GetFormatsUseCase:
         self._sessions = sessions
 
     async def execute(self, *, user_id: int, url: str, platform: Platform) -> FormatListDTO:
-        logger.info(
-            "[GET_FORMATS] start user_id=%s platform=%s url=%s",
-            user_id,
-            platform,
-            url,
-        )
-        
         adapter = self._registry.get(platform)
-        logger.info(
-            "[GET_FORMATS] adapter resolved: %s",
-            adapter.__class__.__name__,
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[GET_FORMATS] adapter resolved: %s",
+                adapter.__class__.__name__,
+            )
 
         choices = await adapter.extract_choices(url)
-        logger.info(
-            "[GET_FORMATS] choices extracted: %d",
-            len(choices),
-        )
 
         version = self._sessions.new_session(
             user_id=user_id,
             url=url,
-            platform_key=platform.value,
+            platform=platform,
             choices=choices,
         )
         logger.info(
-            "[GET_FORMATS] session stored user_id=%s version=%s",
+            "[GET_FORMATS] done user_id=%s platform=%s url=%s choices=%d version=%s",
             user_id,
+            platform.value,
+            url,
+            len(choices),
             version,
         )
 
         return FormatListDTO(
             platform=platform,
-            choices=choices,
+            choices=tuple(choices),
             session_version=version,
         )
\ No newline at end of file
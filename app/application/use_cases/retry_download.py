@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from app.application.dto import EnqueueResultDTO
 
+_RETRY_UNSUPPORTED = EnqueueResultDTO(
+    accepted=False,
+    message="Повтор загрузки пока не поддерживается.",
+)
+
 
 class RetryDownloadUseCase:
     async def execute(self) -> EnqueueResultDTO:
-        return EnqueueResultDTO(
-            accepted=False,
-            message="Повтор загрузки пока не поддерживается.",
-        )
\ No newline at end of file
+        return _RETRY_UNSUPPORTED
\ No newline at end of file
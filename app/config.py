@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
+import operator
 import os
 
 
@@ -35,13 +36,38 @@ def _env_int(name: str, *, default: int | None = None, min_value: int | None = N
     return value
 
 
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+_FALSE_VALUES = frozenset({"0", "false", "no", "off"})
+
+
+def _env_bool(name: str, *, default: bool) -> bool:
+    raw = _env(name)
+    if raw is None:
+        return default
+    v = raw.lower()
+    if v in _TRUE_VALUES:
+        return True
+    if v in _FALSE_VALUES:
+        return False
+    raise SettingsError(f"Invalid bool for {name}: {raw!r} (expected 1/0, true/false, yes/no, on/off)")
+
+
 def _env_path(name: str, *, default: str | None = None) -> Path:
     raw = _env(name)
     if raw is None:
         if default is None:
             raise SettingsError(f"Missing required env var: {name}")
         raw = default
-    return Path(raw).expanduser().resolve()
+    # abspath is pure string work; resolve() would stat every path component.
+    return Path(os.path.abspath(os.path.expanduser(raw)))
+
+
+# Cross-field limits: (left attr, op, right attr, error). Checked as op(left, right).
+_BOUNDS = (
+    ("tg_safe_limit_mb", operator.lt, "tg_hard_limit_mb", "TG_SAFE_LIMIT_MB must be < TG_HARD_LIMIT_MB"),
+    ("tg_risky_limit_mb", operator.le, "tg_hard_limit_mb", "TG_RISKY_LIMIT_MB must be <= TG_HARD_LIMIT_MB"),
+    ("tg_best_effort_from_mb", operator.le, "tg_hard_limit_mb", "TG_BEST_EFFORT_FROM_MB must be <= TG_HARD_LIMIT_MB"),
+)
 
 
 @dataclass(frozen=True, slots=True)
@@ -70,6 +96,9 @@ class Settings:
     rate_limiter_idle_ttl_sec: int
     active_jobs_stale_ttl_sec: int
 
+    # Media
+    ffmpeg_fragmented_mp4: bool     # single-pass fragmented MP4 instead of +faststart rewrite
+
     @classmethod
     def from_env(cls) -> "Settings":
         token = _env("BOT_TOKEN")
@@ -97,6 +126,8 @@ class Settings:
         rate_limiter_idle_ttl_sec = _env_int("RATE_LIMITER_IDLE_TTL_SEC", default=3600, min_value=60)
         active_jobs_stale_ttl_sec = _env_int("ACTIVE_JOBS_STALE_TTL_SEC", default=7200, min_value=300)
 
+        ffmpeg_fragmented_mp4 = _env_bool("FFMPEG_FRAGMENTED_MP4", default=False)
+
         s = cls(
             bot_token=token,
             log_level=log_level,
@@ -114,6 +145,7 @@ class Settings:
             session_ttl_sec=session_ttl_sec,
             rate_limiter_idle_ttl_sec=rate_limiter_idle_ttl_sec,
             active_jobs_stale_ttl_sec=active_jobs_stale_ttl_sec,
+            ffmpeg_fragmented_mp4=ffmpeg_fragmented_mp4,
         )
         s._validate()
         return s
@@ -127,11 +159,8 @@ class Settings:
         if self.temp_root.name == "":
             raise SettingsError("TEMP_ROOT must be a directory path, got empty name")
 
-        if self.tg_safe_limit_mb >= self.tg_hard_limit_mb:
-            raise SettingsError("TG_SAFE_LIMIT_MB must be < TG_HARD_LIMIT_MB")
-        if self.tg_risky_limit_mb > self.tg_hard_limit_mb:
-            raise SettingsError("TG_RISKY_LIMIT_MB must be <= TG_HARD_LIMIT_MB")
-        if self.tg_best_effort_from_mb > self.tg_hard_limit_mb:
-            raise SettingsError("TG_BEST_EFFORT_FROM_MB must be <= TG_HARD_LIMIT_MB")
+        for left, op, right, message in _BOUNDS:
+            if not op(getattr(self, left), getattr(self, right)):
+                raise SettingsError(message)
         if self.tg_document_only_from_mb <= 0:
             raise SettingsError("TG_DOCUMENT_ONLY_FROM_MB must be > 0")
@@ -20,6 +20,7 @@ UX_MINE_BAD_LINK: str = "⚒️ Здесь добывают только вид
 UX_MINE_UNSUPPORTED_LINK: str = "⚠️ В этом районе пока не добываем. Ссылка не поддерживается."
 UX_MINE_TRY_LATER: str = "⚠️ Шахта временно недоступна. Попробуй позже."
 UX_MINE_SEND_FAILED: str = "⚠️ Telegram не принял груз. Попробуй качество ниже."
+UX_MINE_SENT_UNVERIFIED: str = "⚠️ Видео отправлено, но проверка файла не прошла — оно может не воспроизводиться.\n\nПричина: {reason}"
 
 # User-facing messages
 MSG_FORMAT_RISKY_WARNING: str = "⚠️ Формат “капризный”, может сорваться. Но я попробую добыть результат до конца."
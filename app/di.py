@@ -3,9 +3,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import logging
-from typing import Any, Protocol, runtime_checkable
-
-from aiogram import Bot
+from typing import TYPE_CHECKING, Any, Callable, Protocol, runtime_checkable
 
 from .config import Settings
 from .constants import APP_NAME, UX_STATUS_MIN_EDIT_INTERVAL_SEC
@@ -14,20 +12,24 @@ from .infrastructure.active_jobs import ActiveJobsRegistry
 from .infrastructure.rate_limiter import RateLimiter
 from .infrastructure.session_store import SessionStore
 from .infrastructure.temp_storage import TempStorage
-from .infrastructure.telegram_sender import TelegramSender
-from .infrastructure.status_animator import StatusAnimator
 from .infrastructure.yt import YdlClient, YdlConfig
 from .infrastructure.ffmpeg import FfmpegMerger, FfprobeClient
 from .infrastructure.platform_detector import PlatformDetector
 from .infrastructure.platforms import PlatformRegistry, YouTubeAdapter, VkAdapter, RutubeAdapter
 from .infrastructure.download_queue import DownloadQueue
-from .application.services import DownloadService
 from .application.use_cases.parse_link import ParseLinkUseCase
 from .application.use_cases.get_formats import GetFormatsUseCase
-from .application.use_cases.enqueue_download import EnqueueDownloadUseCase
-from .application.use_cases.cancel_download import CancelDownloadUseCase
 from .application.use_cases.retry_download import RetryDownloadUseCase
 
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+    from .application.services import DownloadService
+    from .application.use_cases.cancel_download import CancelDownloadUseCase
+    from .application.use_cases.enqueue_download import EnqueueDownloadUseCase
+    from .infrastructure.status_animator import StatusAnimator
+    from .infrastructure.telegram_sender import TelegramSender
+
 
 class DIError(RuntimeError):
     pass
@@ -48,108 +50,170 @@ class Container:
     settings: Settings
     logger: logging.Logger
     _components: dict[str, Any]
+    _factories: dict[str, Callable[[], Any]]
+    _managed: list[str]
 
     @classmethod
     def build(cls) -> "Container":
         settings = Settings.from_env()
         logger = logging.getLogger(APP_NAME)
-        return cls(settings=settings, logger=logger, _components={})
-
-    def register(self, name: str, component: Any) -> None:
-        if name in self._components:
+        return cls(settings=settings, logger=logger, _components={}, _factories={}, _managed=[])
+
+    def register_factory(self, name: str, factory: Callable[[], Any], *, managed: bool = False) -> None:
+        """
+        Register a zero-arg factory; the component is built on first get() and memoized.
+        managed=True marks an AsyncStartStop component that the lifecycle starts and stops.
+        """
+        if name in self._components or name in self._factories:
             raise DIError(f"Component already registered: {name}")
-        self._components[name] = component
+        self._factories[name] = factory
+        if managed:
+            self._managed.append(name)
 
     def get(self, name: str) -> Any:
         try:
             return self._components[name]
-        except KeyError as exc:
-            raise DIError(f"Unknown component: {name}") from exc
+        except KeyError:
+            pass
+        # Wiring runs on the event loop thread only, so no lock around build-once.
+        factory = self._factories.pop(name, None)
+        if factory is None:
+            raise DIError(f"Unknown component: {name}")
+        component = factory()
+        self._components[name] = component
+        return component
 
-    def all_components(self) -> list[tuple[str, Any]]:
-        return list(self._components.items())
+    def managed_components(self) -> list[tuple[str, Any]]:
+        # Builds only the lifecycle-managed components (and their dependencies); everything
+        # else stays lazy until requested. Factories pull dependencies through get(), so
+        # _components insertion order puts dependencies before their dependents.
+        for name in self._managed:
+            self.get(name)
+        managed = set(self._managed)
+        return [(name, c) for name, c in self._components.items() if name in managed]
 
 
 def build_graph(container: Container) -> None:
+    """
+    Registers factories only: each component is constructed on first get().
+    """
     s = container.settings
-
-    tg_limits = TelegramLimits(
-        hard_bytes=s.tg_hard_limit_mb * 1024 * 1024,
-        safe_bytes=s.tg_safe_limit_mb * 1024 * 1024,
-        risky_bytes=s.tg_risky_limit_mb * 1024 * 1024,
-        best_effort_from_bytes=s.tg_best_effort_from_mb * 1024 * 1024,
+    get = container.get
+
+    container.register_factory(
+        "tg_limits",
+        lambda: TelegramLimits.from_mb(
+            hard_mb=s.tg_hard_limit_mb,
+            safe_mb=s.tg_safe_limit_mb,
+            risky_mb=s.tg_risky_limit_mb,
+            best_effort_from_mb=s.tg_best_effort_from_mb,
+        ),
     )
 
-    session_store = SessionStore(ttl_sec=s.session_ttl_sec)
-    rate_limiter: RateLimiterPort = RateLimiter(
-        limit=s.rate_limit_per_user,
-        window_sec=s.rate_limit_window_sec,
-        idle_ttl_sec=s.rate_limiter_idle_ttl_sec,
-    )
-    active_jobs = ActiveJobsRegistry(
-        max_active_per_user=s.max_active_jobs_per_user,
-        stale_ttl_sec=s.active_jobs_stale_ttl_sec,
+    container.register_factory("ydl", lambda: YdlClient(cfg=YdlConfig()))
+    container.register_factory("ffmpeg", lambda: FfmpegMerger(fragmented_mp4=s.ffmpeg_fragmented_mp4))
+    container.register_factory("ffprobe", FfprobeClient)
+
+    container.register_factory("platform_detector", PlatformDetector)
+    container.register_factory(
+        "platform_registry",
+        lambda: PlatformRegistry(
+            youtube=YouTubeAdapter(ydl=get("ydl"), tg_limits=get("tg_limits")),
+            vk=VkAdapter(ydl=get("ydl"), tg_limits=get("tg_limits")),
+            rutube=RutubeAdapter(ydl=get("ydl"), tg_limits=get("tg_limits")),
+        ),
     )
 
-    temp_storage = TempStorage(root=s.temp_root)
+    # aiogram-backed modules are imported inside their factories: importing app.di (and
+    # failing fast on bad settings) does not pay for the aiogram import graph.
+    def _bot() -> Bot:
+        from aiogram import Bot
+
+        return Bot(token=s.bot_token)
 
-    ydl = YdlClient(cfg=YdlConfig())
-    ffmpeg = FfmpegMerger()
-    ffprobe = FfprobeClient()
+    def _telegram_sender() -> TelegramSender:
+        from .infrastructure.telegram_sender import TelegramSender
 
-    detector = PlatformDetector()
-    yt_adapter = YouTubeAdapter(ydl=ydl, tg_limits=tg_limits)
-    vk_adapter = VkAdapter(ydl=ydl, tg_limits=tg_limits)
-    rutube_adapter = RutubeAdapter(ydl=ydl, tg_limits=tg_limits)
-    registry = PlatformRegistry(youtube=yt_adapter, vk=vk_adapter, rutube=rutube_adapter)
+        return TelegramSender(
+            bot=get("bot"),
+            hard_limit_mb=s.tg_hard_limit_mb,
+            document_only_from_mb=s.tg_document_only_from_mb,
+        )
 
-    bot = Bot(token=s.bot_token)
+    def _status_animator() -> StatusAnimator:
+        from .infrastructure.status_animator import StatusAnimator
 
-    sender = TelegramSender(
-        bot=bot,
-        hard_limit_mb=s.tg_hard_limit_mb,
-        document_only_from_mb=s.tg_document_only_from_mb,
+        return StatusAnimator(sender=get("telegram_sender"), min_edit_interval_sec=UX_STATUS_MIN_EDIT_INTERVAL_SEC)
+
+    container.register_factory("bot", _bot)
+    container.register_factory("telegram_sender", _telegram_sender)
+    container.register_factory("status_animator", _status_animator, managed=True)
+
+    container.register_factory("session_store", lambda: SessionStore(ttl_sec=s.session_ttl_sec))
+
+    def _rate_limiter() -> RateLimiterPort:
+        return RateLimiter(
+            limit=s.rate_limit_per_user,
+            window_sec=s.rate_limit_window_sec,
+            idle_ttl_sec=s.rate_limiter_idle_ttl_sec,
+        )
+
+    container.register_factory("rate_limiter", _rate_limiter)
+    container.register_factory("temp_storage", lambda: TempStorage(root=s.temp_root), managed=True)
+    container.register_factory(
+        "active_jobs",
+        lambda: ActiveJobsRegistry(
+            max_active_per_user=s.max_active_jobs_per_user,
+            stale_ttl_sec=s.active_jobs_stale_ttl_sec,
+        ),
     )
 
-    status_animator = StatusAnimator(sender=sender, min_edit_interval_sec=UX_STATUS_MIN_EDIT_INTERVAL_SEC)
-
-    downloads = DownloadService(
-        temp_storage=temp_storage,
-        ydl=ydl,
-        ffmpeg=ffmpeg,
-        ffprobe=ffprobe,
-        telegram_sender=sender,
-        status_animator=status_animator,
-        active_jobs=active_jobs,
-        tg_hard_limit_bytes=tg_limits.hard_bytes,
+    def _download_service() -> DownloadService:
+        from .application.services import DownloadService
+
+        return DownloadService(
+            temp_storage=get("temp_storage"),
+            ydl=get("ydl"),
+            ffmpeg=get("ffmpeg"),
+            ffprobe=get("ffprobe"),
+            telegram_sender=get("telegram_sender"),
+            status_animator=get("status_animator"),
+            active_jobs=get("active_jobs"),
+            tg_hard_limit_bytes=get("tg_limits").hard_bytes,
+        )
+
+    container.register_factory("download_service", _download_service)
+    container.register_factory(
+        "download_queue",
+        lambda: DownloadQueue(
+            maxsize=s.queue_maxsize,
+            workers=s.max_parallel_downloads,
+            handler=get("download_service").handle_job,
+        ),
+        managed=True,
     )
 
-    queue = DownloadQueue(
-        maxsize=s.queue_maxsize,
-        workers=s.max_parallel_downloads,
-        handler=downloads.handle_job,
+    container.register_factory("parse_link_uc", lambda: ParseLinkUseCase(detector=get("platform_detector")))
+    container.register_factory(
+        "get_formats_uc",
+        lambda: GetFormatsUseCase(registry=get("platform_registry"), sessions=get("session_store")),
     )
 
-    parse_link = ParseLinkUseCase(detector=detector)
-    get_formats = GetFormatsUseCase(registry=registry, sessions=session_store)
-    enqueue = EnqueueDownloadUseCase(sessions=session_store, queue=queue, downloads=downloads, active_jobs=active_jobs)
-    cancel = CancelDownloadUseCase(downloads=downloads)
-    retry = RetryDownloadUseCase()
-
-    container.register("bot", bot)
-    container.register("telegram_sender", sender)
-    container.register("status_animator", status_animator)
-
-    container.register("session_store", session_store)
-    container.register("rate_limiter", rate_limiter)
-    container.register("temp_storage", temp_storage)
-    container.register("active_jobs", active_jobs)
-
-    container.register("download_service", downloads)
-    container.register("download_queue", queue)
-
-    container.register("parse_link_uc", parse_link)
-    container.register("get_formats_uc", get_formats)
-    container.register("enqueue_download_uc", enqueue)
-    container.register("cancel_download_uc", cancel)
-    container.register("retry_download_uc", retry)
+    def _enqueue_download_uc() -> EnqueueDownloadUseCase:
+        from .application.use_cases.enqueue_download import EnqueueDownloadUseCase
+
+        return EnqueueDownloadUseCase(
+            sessions=get("session_store"),
+            queue=get("download_queue"),
+            downloads=get("download_service"),
+            active_jobs=get("active_jobs"),
+        )
+
+    def _cancel_download_uc() -> CancelDownloadUseCase:
+        from .application.use_cases.cancel_download import CancelDownloadUseCase
+
+        return CancelDownloadUseCase(downloads=get("download_service"))
+
+    container.register_factory("enqueue_download_uc", _enqueue_download_uc)
+    container.register_factory("cancel_download_uc", _cancel_download_uc)
+    container.register_factory("retry_download_uc", RetryDownloadUseCase)
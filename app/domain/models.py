@@ -106,7 +106,7 @@ class FormatChoice:
         return self.container.value
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class Job:
     job_id: JobId
     user_id: UserId
@@ -2,7 +2,11 @@
 from __future__ import annotations
 
 import hashlib
+import sys
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+from typing import Iterable
 
 from .errors import ValidationError
 from .models import (
@@ -24,6 +28,16 @@ class TelegramLimits:
     risky_bytes: int
     best_effort_from_bytes: int
 
+    @classmethod
+    def from_mb(cls, *, hard_mb: int, safe_mb: int, risky_mb: int, best_effort_from_mb: int) -> "TelegramLimits":
+        # MiB -> bytes once at wiring time; everything downstream compares integer bytes.
+        return cls(
+            hard_bytes=hard_mb << 20,
+            safe_bytes=safe_mb << 20,
+            risky_bytes=risky_mb << 20,
+            best_effort_from_bytes=best_effort_from_mb << 20,
+        )
+
 
 @dataclass(frozen=True, slots=True)
 class RawExtractorFormat:
@@ -50,26 +64,88 @@ class RawExtractorFormat:
     filesize_bytes: int | None
 
 
+# Enum members are singletons: compare with `is`, and keep member sets at module level
+# instead of building a tuple on every call.
+_RISKY_VCODECS = frozenset({VideoCodec.AV1, VideoCodec.VP9})
+_MKV_ACODECS = frozenset({AudioCodec.OPUS, AudioCodec.VORBIS})
+
+# Rank/mark lookup tables, one entry per enum member (lower rank = better).
+_MARK: dict[ChoiceAvailability, str] = {
+    ChoiceAvailability.GUARANTEED: "✅",
+    ChoiceAvailability.RISKY: "⚠️",
+    ChoiceAvailability.UNAVAILABLE: "❌",
+}
+_AVAIL_RANK: dict[ChoiceAvailability, int] = {
+    ChoiceAvailability.GUARANTEED: 0,
+    ChoiceAvailability.RISKY: 1,
+    ChoiceAvailability.UNAVAILABLE: 2,
+}
+_CONTAINER_RANK: dict[Container, int] = {
+    Container.MP4: 0,
+    Container.MKV: 1,
+}
+_CODEC_RANK: dict[VideoCodec, int] = {
+    VideoCodec.H264: 0,
+    VideoCodec.H265: 1,
+    VideoCodec.VP9: 2,
+    VideoCodec.AV1: 3,
+    VideoCodec.UNKNOWN: 9,
+}
+
+
 def _fps_int(fps: float | None) -> int:
     if fps is None or fps <= 0:
         return 0
     return int(round(fps))
 
 
+_HEIGHT_KEY = attrgetter("height")
+
+# Seed parts encoded once: the platform prefix per key, enum values at import.
+_SEED_VALUE_BYTES: dict[VideoCodec | Container, bytes] = {
+    m: m.value.encode("utf-8") for m in (*VideoCodec, *Container)
+}
+
+
+@lru_cache(maxsize=64)
+def _seed_prefix(platform_key: str) -> bytes:
+    return f"{platform_key}:".encode("utf-8")
+
+
+# Same (platform, height, fps, codec, container) tuples recur across requests for the same
+# URL; all arguments are hashable, so hits skip seed building and hashing entirely.
+@lru_cache(maxsize=4096)
 def _stable_choice_id(platform_key: str, height: int, fps_int: int, vcodec: VideoCodec, container: Container) -> str:
-    seed = f"{platform_key}:{height}:{fps_int}:{vcodec.value}:{container.value}".encode("utf-8")
-    return hashlib.sha1(seed).hexdigest()[:16]
+    # Same bytes as f"{platform_key}:{height}:{fps_int}:{vcodec.value}:{container.value}".encode().
+    seed = _seed_prefix(platform_key) + b"%d:%d:%b:%b" % (
+        height,
+        fps_int,
+        _SEED_VALUE_BYTES[vcodec],
+        _SEED_VALUE_BYTES[container],
+    )
+    # 8-byte digest produced natively: same 16 hex chars, no truncated SHA-1.
+    return sys.intern(hashlib.blake2b(seed, digest_size=8).hexdigest())
 
 
-def choose_container(*, vcodec: VideoCodec, acodec: AudioCodec) -> Container:
+def _container_rule(vcodec: VideoCodec, acodec: AudioCodec) -> Container:
     # safest default: MP4 with H.264(+AAC). Anything else increases risk.
-    if vcodec in (VideoCodec.AV1, VideoCodec.VP9):
+    if vcodec in _RISKY_VCODECS:
         return Container.MKV
-    if acodec in (AudioCodec.OPUS, AudioCodec.VORBIS):
+    if acodec in _MKV_ACODECS:
         return Container.MKV
     return Container.MP4
 
 
+# Only |VideoCodec| x |AudioCodec| possible inputs: evaluate the rule once per pair at import.
+_CONTAINER_TABLE: dict[tuple[VideoCodec, AudioCodec], Container] = {
+    (v, a): _container_rule(v, a) for v in VideoCodec for a in AudioCodec
+}
+
+
+def choose_container(vcodec: VideoCodec, acodec: AudioCodec) -> Container:
+    return _CONTAINER_TABLE[vcodec, acodec]
+
+
 def _estimate_total_bytes(video: RawExtractorFormat, audio: RawExtractorFormat) -> int | None:
     if video.filesize_bytes is None or audio.filesize_bytes is None:
         return None
@@ -78,167 +154,158 @@ def _estimate_total_bytes(video: RawExtractorFormat, audio: RawExtractorFormat)
     return int(total * 1.01)
 
 
+# Index bits: 4K (+2), 60fps (+2), MKV (+1), AV1/VP9 (+1).
+_RISK_TABLE: tuple[int, ...] = tuple(
+    2 * (i >> 3 & 1) + 2 * (i >> 2 & 1) + (i >> 1 & 1) + (i & 1) for i in range(16)
+)
+
+
 def _risk_boost(*, height: int, fps_int: int, vcodec: VideoCodec, container: Container) -> int:
     """
     Purely UX-level risk heuristic.
     - 4K/60fps are common pain points in Telegram delivery and processing.
     - MKV/AV1/VP9 increase compatibility risk.
     """
-    boost = 0
-    if height >= 2160:
-        boost += 2
-    if fps_int >= 60:
-        boost += 2
-    if container == Container.MKV:
-        boost += 1
-    if vcodec in (VideoCodec.AV1, VideoCodec.VP9):
-        boost += 1
-    return boost
+    return _RISK_TABLE[
+        (height >= 2160) << 3
+        | (fps_int >= 60) << 2
+        | (container is Container.MKV) << 1
+        | (vcodec in _RISKY_VCODECS)
+    ]
+
+
+# Index: over_hard << 1 | (within safe zone and no risk boost). Over the hard limit wins.
+_AVAIL_TABLE: tuple[ChoiceAvailability, ...] = (
+    ChoiceAvailability.RISKY,        # between safe and hard, or boosted
+    ChoiceAvailability.GUARANTEED,   # safe zone, no boost
+    ChoiceAvailability.UNAVAILABLE,  # exceeds hard limit
+    ChoiceAvailability.UNAVAILABLE,
+)
 
 
 def _availability(*, estimated: int | None, limits: TelegramLimits, risk_boost: int) -> ChoiceAvailability:
-    if estimated is not None and estimated > limits.hard_bytes:
-        return ChoiceAvailability.UNAVAILABLE
-
     # Unknown size => cannot guarantee; show risky (but not blocked).
     if estimated is None:
         return ChoiceAvailability.RISKY
-
-    # Safe zone upper bound, but boost can move it to risky.
-    if estimated <= limits.safe_bytes and risk_boost == 0:
-        return ChoiceAvailability.GUARANTEED
-    if estimated <= limits.safe_bytes and risk_boost >= 3:
-        return ChoiceAvailability.RISKY
-
-    # Between safe and hard => risky.
-    return ChoiceAvailability.RISKY
+    return _AVAIL_TABLE[
+        (estimated > limits.hard_bytes) << 1
+        | (estimated <= limits.safe_bytes and risk_boost == 0)
+    ]
 
 
 def _mark(av: ChoiceAvailability) -> str:
-    if av == ChoiceAvailability.GUARANTEED:
-        return "✅"
-    if av == ChoiceAvailability.RISKY:
-        return "⚠️"
-    return "❌"
+    return _MARK[av]
 
 
 def build_label(*, height: int, availability: ChoiceAvailability) -> str:
-    return f"{_mark(availability)} {height}p"
+    return _label(height, availability)
+
+
+# Few distinct (height, availability) pairs: one shared interned string per label.
+@lru_cache(maxsize=256)
+def _label(height: int, availability: ChoiceAvailability) -> str:
+    return sys.intern(f"{_mark(availability)} {height}p")
 
 
-def _choice_rank(c: FormatChoice) -> tuple[int, int, int, int, int]:
+def _rank(
+    availability: ChoiceAvailability,
+    container: Container,
+    vcodec: VideoCodec,
+    fps_int: int,
+    estimated: int | None,
+) -> tuple[int, int, int, int, int]:
     """
     Чем МЕНЬШЕ tuple — тем формат ЛУЧШЕ.
     """
-    availability_rank = _availability_rank(c.availability)
-
-    container_rank = 0 if c.container == Container.MP4 else 1
-
-    codec_rank = {
-        VideoCodec.H264: 0,
-        VideoCodec.H265: 1,
-        VideoCodec.VP9: 2,
-        VideoCodec.AV1: 3,
-    }.get(c.vcodec, 9)
-
-    fps_rank = -c.fps_int
-
-    size_rank = c.estimated_bytes if c.estimated_bytes is not None else 10**18
-
     return (
-        availability_rank,
-        container_rank,
-        codec_rank,
-        fps_rank,
-        size_rank,
+        _AVAIL_RANK[availability],
+        _CONTAINER_RANK[container],
+        _CODEC_RANK[vcodec],
+        -fps_int,
+        estimated if estimated is not None else 10**18,
     )
 
+
 def build_format_choices(
     *,
     platform_key: str,
     raw_formats: list[RawExtractorFormat],
     tg_limits: TelegramLimits,
 ) -> list[FormatChoice]:
-    videos = [f for f in raw_formats if f.is_video and not f.is_audio]
-    audios = [f for f in raw_formats if f.is_audio and not f.is_video]
-    muxed = [f for f in raw_formats if f.is_video and f.is_audio]
+    videos: list[RawExtractorFormat] = []
+    audios: list[RawExtractorFormat] = []
+    muxed: list[RawExtractorFormat] = []
+    # One pass, bucket index = is_video << 1 | is_audio (0 = neither: dropped).
+    buckets = (None, audios, videos, muxed)
+    for f in raw_formats:
+        bucket = buckets[f.is_video << 1 | f.is_audio]
+        if bucket is not None:
+            bucket.append(f)
+
+    # (video stream, audio stream, estimated bytes) per candidate.
+    candidates: Iterable[tuple[RawExtractorFormat, RawExtractorFormat, int | None]]
 
     # If extractor provides muxed (progressive) formats (common on RuTube),
     # fall back to muxed choices when we cannot form video-only + audio-only pairs.
     if muxed and (not videos or not audios):
-        built: list[FormatChoice] = []
-        for m in muxed:
-            height = int(m.height or 0)
-            if height <= 0:
-                continue
-
-            fps_int = _fps_int(m.fps)
-            vcodec = m.vcodec
-            acodec = m.acodec
-            container = choose_container(vcodec=vcodec, acodec=acodec)
-
-            estimated = int(m.filesize_bytes * 1.01) if m.filesize_bytes is not None else None
-            boost = _risk_boost(height=height, fps_int=fps_int, vcodec=vcodec, container=container)
-            availability = _availability(estimated=estimated, limits=tg_limits, risk_boost=boost)
-
-            choice_id = _stable_choice_id(platform_key, height, fps_int, vcodec, container)
-            label = build_label(height=height, availability=availability)
-
-            built.append(
-                FormatChoice(
-                    choice_id=choice_id,
-                    label=label,
-                    container=container,
-                    availability=availability,
-                    video=VideoSpec(
-                        fmt=StreamSpec(m.extractor_format_id, vcodec, m.vbr_kbps),
-                        width=m.width,
-                        height=m.height,
-                        fps=m.fps,
-                    ),
-                    audio=AudioSpec(
-                        fmt=StreamSpec(m.extractor_format_id, acodec, m.abr_kbps),
-                        sample_rate_hz=None,
-                    ),
-                    height=height,
-                    fps_int=fps_int,
-                    vcodec=vcodec,
-                    estimated_bytes=estimated,
-                )
-            )
+        candidates = (
+            (m, m, int(m.filesize_bytes * 1.01) if m.filesize_bytes is not None else None)
+            for m in muxed
+        )
+    else:
+        if not videos or not audios:
+            raise ValidationError("Не удалось найти корректные форматы (нужны видео и аудио).")
 
-        if not built:
-            raise ValidationError("Не удалось подобрать форматы.")
+        best_audio = max(audios, key=lambda a: (a.abr_kbps or 0, a.filesize_bytes or 0))
+        candidates = ((v, best_audio, _estimate_total_bytes(v, best_audio)) for v in videos)
 
-        return deduplicate_choices(built)
+    return _select_choices(platform_key=platform_key, candidates=candidates, tg_limits=tg_limits)
 
-    if not videos or not audios:
-        raise ValidationError("Не удалось найти корректные форматы (нужны видео и аудио).")
 
-    best_audio = max(audios, key=lambda a: (a.abr_kbps or 0, a.filesize_bytes or 0))
-    acodec = best_audio.acodec
+def _select_choices(
+    *,
+    platform_key: str,
+    candidates: Iterable[tuple[RawExtractorFormat, RawExtractorFormat, int | None]],
+    tg_limits: TelegramLimits,
+) -> list[FormatChoice]:
+    """
+    Build + dedup in one pass: 1 height = 1 button, and a FormatChoice is only
+    constructed for the winner of each height.
+    """
+    # height -> (rank, video, audio, fps_int, container, availability, estimated)
+    best_by_height: dict[int, tuple] = {}
+    seen_any = False
 
-    built: list[FormatChoice] = []
-    for v in videos:
+    for v, a, estimated in candidates:
         height = int(v.height or 0)
         if height <= 0:
             continue
+        seen_any = True
 
         fps_int = _fps_int(v.fps)
         vcodec = v.vcodec
-        container = choose_container(vcodec=vcodec, acodec=acodec)
+        container = choose_container(vcodec, a.acodec)
 
-        estimated = _estimate_total_bytes(v, best_audio)
         boost = _risk_boost(height=height, fps_int=fps_int, vcodec=vcodec, container=container)
         availability = _availability(estimated=estimated, limits=tg_limits, risk_boost=boost)
+        if availability is ChoiceAvailability.UNAVAILABLE:
+            continue  # ❌ не показываем вообще; it would also lose every rank comparison
 
-        choice_id = _stable_choice_id(platform_key, height, fps_int, vcodec, container)
-        label = build_label(height=height, availability=availability)
+        rank = _rank(availability, container, vcodec, fps_int, estimated)
+        cur = best_by_height.get(height)
+        if cur is None or rank < cur[0]:
+            best_by_height[height] = (rank, v, a, fps_int, container, availability, estimated)
+
+    if not seen_any:
+        raise ValidationError("Не удалось подобрать форматы.")
 
-        built.append(
+    final: list[FormatChoice] = []
+    for height, (_, v, a, fps_int, container, availability, estimated) in best_by_height.items():
+        vcodec = v.vcodec
+        final.append(
             FormatChoice(
-                choice_id=choice_id,
-                label=label,
+                choice_id=_stable_choice_id(platform_key, height, fps_int, vcodec, container),
+                label=build_label(height=height, availability=availability),
                 container=container,
                 availability=availability,
                 video=VideoSpec(
@@ -248,7 +315,7 @@ def build_format_choices(
                     fps=v.fps,
                 ),
                 audio=AudioSpec(
-                    fmt=StreamSpec(best_audio.extractor_format_id, acodec, best_audio.abr_kbps),
+                    fmt=StreamSpec(a.extractor_format_id, a.acodec, a.abr_kbps),
                     sample_rate_hz=None,
                 ),
                 height=height,
@@ -258,55 +325,6 @@ def build_format_choices(
             )
         )
 
-    if not built:
-        raise ValidationError("Не удалось подобрать форматы.")
-
-    return deduplicate_choices(built)
-
-
-def deduplicate_choices(choices: list[FormatChoice]) -> list[FormatChoice]:
-    """
-    1 height = 1 button (best format).
-    """
-    best_by_height: dict[int, FormatChoice] = {}
-
-    for c in choices:
-        cur = best_by_height.get(c.height)
-        if cur is None or _choice_rank(c) < _choice_rank(cur):
-            best_by_height[c.height] = c
-
-    # пере-лейблим после выбора победителя
-    final: list[FormatChoice] = []
-
-    for c in best_by_height.values():
-        if c.availability == ChoiceAvailability.UNAVAILABLE:
-            continue  # ❌ не показываем вообще
-
-        final.append(
-            FormatChoice(
-                choice_id=c.choice_id,
-                label=build_label(height=c.height, availability=c.availability),
-                container=c.container,
-                availability=c.availability,
-                video=c.video,
-                audio=c.audio,
-                height=c.height,
-                fps_int=c.fps_int,
-                vcodec=c.vcodec,
-                estimated_bytes=c.estimated_bytes,
-            )
-        )
-
     # сортировка для UI
-    return sorted(
-    final,
-    key=lambda c: -c.height,
-    )
-
-
-def _availability_rank(av: ChoiceAvailability) -> int:
-    if av == ChoiceAvailability.GUARANTEED:
-        return 0
-    if av == ChoiceAvailability.RISKY:
-        return 1
-    return 2
+    final.sort(key=_HEIGHT_KEY, reverse=True)
+    return final
@@ -4,24 +4,31 @@ from .errors import ValidationError
 from .models import FormatChoice, JobStage
 
 
-_ALLOWED_TRANSITIONS: dict[JobStage, set[JobStage]] = {
-    JobStage.QUEUED: {JobStage.ANALYZING, JobStage.CANCELED, JobStage.FAILED},
-    JobStage.ANALYZING: {JobStage.DOWNLOADING, JobStage.CANCELED, JobStage.FAILED},
-    JobStage.DOWNLOADING: {JobStage.MERGING, JobStage.CANCELED, JobStage.FAILED},
-    JobStage.MERGING: {JobStage.VALIDATING, JobStage.CANCELED, JobStage.FAILED},
-    JobStage.VALIDATING: {JobStage.SENDING, JobStage.CANCELED, JobStage.FAILED},
-    JobStage.SENDING: {JobStage.DONE, JobStage.FAILED},
-    JobStage.DONE: set(),
-    JobStage.FAILED: set(),
-    JobStage.CANCELED: set(),
+_ALLOWED_TRANSITIONS: dict[JobStage, frozenset[JobStage]] = {
+    JobStage.QUEUED: frozenset({JobStage.ANALYZING, JobStage.CANCELED, JobStage.FAILED}),
+    JobStage.ANALYZING: frozenset({JobStage.DOWNLOADING, JobStage.CANCELED, JobStage.FAILED}),
+    JobStage.DOWNLOADING: frozenset({JobStage.MERGING, JobStage.CANCELED, JobStage.FAILED}),
+    JobStage.MERGING: frozenset({JobStage.VALIDATING, JobStage.CANCELED, JobStage.FAILED}),
+    JobStage.VALIDATING: frozenset({JobStage.SENDING, JobStage.CANCELED, JobStage.FAILED}),
+    JobStage.SENDING: frozenset({JobStage.DONE, JobStage.FAILED}),
+    JobStage.DONE: frozenset(),
+    JobStage.FAILED: frozenset(),
+    JobStage.CANCELED: frozenset(),
 }
 
 
+_URL_SCHEMES = ("http://", "https://")
+
+
+def has_url_scheme(url: str) -> bool:
+    return url.startswith(_URL_SCHEMES)
+
+
 def validate_url(url: str) -> None:
     u = url.strip()
     if not u:
         raise ValidationError("Пустая ссылка.")
-    if not (u.startswith("http://") or u.startswith("https://")):
+    if not has_url_scheme(u):
         raise ValidationError("Ссылка должна начинаться с http:// или https://")
     if " " in u:
         raise ValidationError("Ссылка не должна содержать пробелы.")
@@ -1,6 +1,7 @@
 
 from __future__ import annotations
 
+import heapq
 from typing import Dict
 import time
 from typing import Tuple
@@ -19,25 +20,31 @@ class ActiveJobsRegistry:
         self._max = max_active_per_user
         self._stale_ttl_sec = int(stale_ttl_sec)
         self._counts: Dict[int, tuple[int, float]] = {}
-
-    def _prune_stale(self) -> None:
-        if self._stale_ttl_sec <= 0:
-            return
-        now = time.monotonic()
-        stale_user_ids = [
-            user_id
-            for user_id, (_cnt, touched) in self._counts.items()
-            if (now - touched) > self._stale_ttl_sec
-        ]
-        for user_id in stale_user_ids:
-            self._counts.pop(user_id, None)
+        # (expires_at, user_id, touched) per touch. Entries are never removed eagerly: one whose
+        # touched no longer matches _counts is outdated and is skipped when it surfaces.
+        self._expiry_heap: list[tuple[float, int, float]] = []
+
+    def _touch(self, user_id: int, cnt: int, now: float) -> None:
+        self._counts[user_id] = (cnt, now)
+        if self._stale_ttl_sec > 0:
+            heapq.heappush(self._expiry_heap, (now + self._stale_ttl_sec, user_id, now))
+
+    def _prune_stale(self, now: float) -> None:
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _expires_at, user_id, touched = heapq.heappop(heap)
+            entry = self._counts.get(user_id)
+            if entry is not None and entry[1] == touched:
+                del self._counts[user_id]
 
     def try_acquire(self, user_id: int) -> bool:
-        self._prune_stale()
+        # No lock needed: only called from the event loop thread, and nothing here awaits.
+        now = time.monotonic()
+        self._prune_stale(now)
         cur, _touched = self._counts.get(user_id, (0, 0.0))
         if cur >= self._max:
             return False
-        self._counts[user_id] = (cur + 1, time.monotonic())
+        self._touch(user_id, cur + 1, now)
         return True
 
     def release(self, user_id: int) -> None:
@@ -45,4 +52,4 @@ class ActiveJobsRegistry:
         if cur <= 1:
             self._counts.pop(user_id, None)
         else:
-            self._counts[user_id] = (cur - 1, time.monotonic())
+            self._touch(user_id, cur - 1, time.monotonic())
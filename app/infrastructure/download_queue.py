@@ -37,10 +37,17 @@ class DownloadQueue:
     async def stop(self) -> None:
         for task in self._tasks:
             task.cancel()
-        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._tasks:
+            # asyncio.wait never cancels what it waits on: if stop() itself is cancelled, workers
+            # still finish their own cleanup (terminating yt-dlp/ffmpeg), and unlike
+            # gather(return_exceptions=True) unexpected worker errors are surfaced, not dropped.
+            done, _ = await asyncio.wait(self._tasks)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None:
+                    self._logger.error("worker %s exited with error", task.get_name(), exc_info=task.exception())
         self._tasks.clear()
 
-    async def enqueue(self, job: Job) -> asyncio.Event | None:
+    def enqueue(self, job: Job) -> asyncio.Event | None:
         cancel_event = asyncio.Event()
         try:
             self._queue.put_nowait(_QueueItem(job=job, cancel_event=cancel_event))
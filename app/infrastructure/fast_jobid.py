@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import os
+import threading
+
+_ID_BYTES = 16
+_POOL_BYTES = 4096
+
+_pool = b""
+_offset = _POOL_BYTES
+_lock = threading.Lock()
+
+
+def new_job_id_hex() -> str:
+    """
+    Random 128-bit id as 32 hex chars (same shape as uuid4().hex).
+    Slices a pooled os.urandom buffer: one syscall per 256 ids, no UUID object.
+    """
+    global _pool, _offset
+    with _lock:
+        if _offset + _ID_BYTES > _POOL_BYTES:
+            _pool = os.urandom(_POOL_BYTES)
+            _offset = 0
+        start = _offset
+        _offset = start + _ID_BYTES
+        pool = _pool
+    return pool[start:start + _ID_BYTES].hex()
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 from asyncio.subprocess import PIPE, Process
 from app.domain.errors import JobCancelledError
 from dataclasses import dataclass
@@ -14,6 +15,12 @@ class FfmpegError(RuntimeError):
     pass
 
 
+# +faststart relocates the moov atom in a second pass that rereads the whole output.
+# Fragmented MP4 is stream-ready in one pass (opt-in: some clients read its metadata worse).
+_MP4_FASTSTART = ("-movflags", "+faststart")
+_MP4_FRAGMENTED = ("-movflags", "+frag_keyframe+empty_moov+default_base_moof")
+
+
 @dataclass(frozen=True, slots=True)
 class MergeInputs:
     video_path: Path
@@ -26,10 +33,12 @@ class FfmpegMerger:
     """
     Responsible only for merging (muxing) downloaded video+audio into a single container.
     No validation here (validation is ffprobe).
+    The output directory must exist (it is the job workdir holding the inputs).
     """
 
-    def __init__(self) -> None:
+    def __init__(self, *, fragmented_mp4: bool = False) -> None:
         self._logger = logging.getLogger("ffmpeg")
+        self._mp4_flags = _MP4_FRAGMENTED if fragmented_mp4 else _MP4_FASTSTART
 
     async def merge(self, inp: MergeInputs, *, cancel_event: asyncio.Event | None = None) -> Path:
         if not inp.video_path.exists():
@@ -37,8 +46,6 @@ class FfmpegMerger:
         if not inp.audio_path.exists():
             raise FfmpegError("audio input not found")
 
-        inp.output_path.parent.mkdir(parents=True, exist_ok=True)
-
         cmd = [
             "ffmpeg",
             "-hide_banner",
@@ -52,8 +59,8 @@ class FfmpegMerger:
             "-c:a", "copy",
         ]
 
-        if inp.container == Container.MP4:
-            cmd += ["-movflags", "+faststart"]
+        if inp.container is Container.MP4:
+            cmd += self._mp4_flags
 
         cmd += [str(inp.output_path)]
 
@@ -116,7 +123,12 @@ class FfmpegMerger:
             self._logger.error("ffmpeg stderr: %s", (stderr_b or b"").decode(errors="ignore").strip())
             raise FfmpegError("ffmpeg merge failed")
 
-        if not inp.output_path.exists() or inp.output_path.stat().st_size <= 0:
+        # single stat for existence + size
+        try:
+            out_size = os.stat(inp.output_path).st_size
+        except FileNotFoundError:
+            out_size = 0
+        if out_size <= 0:
             raise FfmpegError("ffmpeg produced empty output")
 
         return inp.output_path
\ No newline at end of file
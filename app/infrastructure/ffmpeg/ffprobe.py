@@ -3,11 +3,17 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
 from asyncio.subprocess import PIPE, Process
 from app.domain.errors import JobCancelledError
 from dataclasses import dataclass
 from pathlib import Path
 
+try:
+    import av  # type: ignore
+except ImportError:  # pragma: no cover
+    av = None  # type: ignore[assignment]
+
 
 class FfprobeError(RuntimeError):
     pass
@@ -22,15 +28,50 @@ class ProbeResult:
     format_name: str | None
 
 
+def _probe_av(file_path: Path, size: int) -> ProbeResult:
+    # Header-only demuxer open: same metadata ffprobe reports, without exec + JSON.
+    try:
+        with av.open(str(file_path)) as c:
+            has_video = any(s.type == "video" for s in c.streams)
+            has_audio = any(s.type == "audio" for s in c.streams)
+            duration_sec = c.duration / av.time_base if c.duration is not None else None
+            format_name = c.format.name
+    except Exception as exc:
+        raise FfprobeError("probe failed") from exc
+
+    return ProbeResult(
+        has_video=has_video,
+        has_audio=has_audio,
+        duration_sec=duration_sec,
+        size_bytes=size,
+        format_name=format_name,
+    )
+
+
 class FfprobeClient:
     """
     Async wrapper around ffprobe.
+    Probes in-process via PyAV when it is installed; otherwise spawns ffprobe.
     """
 
     async def probe(self, file_path: Path, *, cancel_event: asyncio.Event | None = None) -> ProbeResult:
-        if not file_path.exists():
-            raise FfprobeError("file does not exist")
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            raise FfprobeError("file does not exist") from None
 
+        if av is not None:
+            if cancel_event is not None and cancel_event.is_set():
+                raise JobCancelledError()
+            return await asyncio.to_thread(_probe_av, file_path, st.st_size)
+        return await self._probe_subprocess(file_path, st.st_size, cancel_event)
+
+    async def _probe_subprocess(
+        self,
+        file_path: Path,
+        size: int,
+        cancel_event: asyncio.Event | None,
+    ) -> ProbeResult:
         cmd = [
             "ffprobe",
             "-v", "error",
@@ -118,7 +159,6 @@ class FfprobeClient:
             except Exception:
                 duration_sec = None
 
-        size = file_path.stat().st_size
         return ProbeResult(
             has_video=has_video,
             has_audio=has_audio,
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from urllib.parse import urlparse
+import re
+from urllib.parse import urlsplit
 
 import logging
 logger = logging.getLogger(__name__)
@@ -8,42 +9,42 @@ logger = logging.getLogger(__name__)
 from app.domain.models import Platform
 from app.domain.errors import UnsupportedPlatformError
 
+# Optional www./m. prefixes + known host, matched in one pass over the lowercased netloc.
+_HOST_RE = re.compile(r"(?:www\.)?(?:m\.)?(youtube\.com|youtu\.be|vk\.com|vk\.ru|vkvideo\.ru|rutube\.ru)")
 
-class PlatformDetector:
-    """
-    URL -> Platform.
-    Stateless and deterministic.
-    """
-
-    def detect(self, url: str) -> Platform:
-        logger.info("[DETECTOR] raw url=%s", url)
+_PLATFORM_BY_HOST: dict[str, Platform] = {
+    "youtube.com": Platform.YOUTUBE,
+    "youtu.be": Platform.YOUTUBE,
+    "vk.com": Platform.VK,
+    "vk.ru": Platform.VK,
+    "vkvideo.ru": Platform.VK,
+    "rutube.ru": Platform.RUTUBE,
+}
 
-        parsed = urlparse(url)
-        host = (parsed.netloc or "").lower()
-        logger.info("[DETECTOR] parsed host before normalize=%s", host)
 
+def detect_platform(url: str) -> Platform:
+    """URL -> Platform using the module-level host pattern (compiled once at import)."""
+    host = (urlsplit(url).netloc or "").lower()
+    if not host:
+        logger.warning("[DETECTOR] empty host")
+        raise UnsupportedPlatformError("Не удалось определить платформу.")
 
-        if not host:
-            logger.warning("[DETECTOR] empty host")
-            raise UnsupportedPlatformError("Не удалось определить платформу.")
+    m = _HOST_RE.fullmatch(host)
+    if m is not None:
+        platform = _PLATFORM_BY_HOST[m.group(1)]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[DETECTOR] host=%s detected %s", host, platform.name)
+        return platform
 
-        if host.startswith("www."):
-            host = host[4:]
-        if host.startswith("m."):
-            host = host[2:]
+    logger.error("[DETECTOR] unsupported host=%s", host)
+    raise UnsupportedPlatformError("Эта платформа пока не поддерживается")
 
-        logger.info("[DETECTOR] normalized host=%s", host)
 
-        if host in {"youtube.com", "youtu.be"}:
-            logger.info("[DETECTOR] detected YOUTUBE")
-            return Platform.YOUTUBE
-
-        if host in {"vk.com", "vk.ru", "vkvideo.ru"}:
-            logger.info("[DETECTOR] detected VK")
-            return Platform.VK
+class PlatformDetector:
+    """
+    URL -> Platform.
+    Stateless and deterministic: a thin handle over detect_platform for DI.
+    """
 
-        if host == "rutube.ru":
-            logger.info("[DETECTOR] detected RUTUBE")
-            return Platform.RUTUBE
-        logger.error("[DETECTOR] unsupported host=%s", host)
-        raise UnsupportedPlatformError("Эта платформа пока не поддерживается")
\ No newline at end of file
+    def detect(self, url: str) -> Platform:
+        return detect_platform(url)
@@ -23,7 +23,8 @@ class PlatformRegistry:
         }
 
     def get(self, platform: Platform) -> AbstractPlatformAdapter:
-        try:
-            return self._adapters[platform]
-        except KeyError as exc:
-            raise UnsupportedPlatformError("Платформа не поддерживается.") from exc
\ No newline at end of file
+        # Adapters are singletons built once above: a plain dict hit, nothing worth memoizing.
+        adapter = self._adapters.get(platform)
+        if adapter is None:
+            raise UnsupportedPlatformError("Платформа не поддерживается.")
+        return adapter
\ No newline at end of file
@@ -6,13 +6,13 @@ from typing import Dict
 
 import time
 
-from app.domain.models import FormatChoice
+from app.domain.models import FormatChoice, Platform
 
 
 @dataclass(slots=True)
 class UserSession:
     url: str
-    platform_key: str
+    platform: Platform
     version: int
     choices: Dict[str, FormatChoice]
     warned_risky_once: bool
@@ -44,12 +44,12 @@ class SessionStore:
         for user_id in expired_user_ids:
             self._sessions.pop(user_id, None)
 
-    def new_session(self, *, user_id: int, url: str, platform_key: str, choices: list[FormatChoice]) -> int:
+    def new_session(self, *, user_id: int, url: str, platform: Platform, choices: list[FormatChoice]) -> int:
         self._prune_expired()
         version = (self._sessions[user_id].version + 1) if user_id in self._sessions else 1
         self._sessions[user_id] = UserSession(
             url=url,
-            platform_key=platform_key,
+            platform=platform,
             version=version,
             choices={c.choice_id: c for c in choices},
             warned_risky_once=False,
@@ -57,19 +57,27 @@ class SessionStore:
         )
         return version
 
-    def get_choice(self, *, user_id: int, version: int, choice_id: str) -> FormatChoice:
+    def _live_session(self, user_id: int, version: int) -> UserSession | None:
         self._prune_expired()
         session = self._sessions.get(user_id)
         if session is None or session.version != version:
-            raise KeyError("session expired")
-        return session.choices[choice_id]
-
-    def get_session_meta(self, *, user_id: int, version: int) -> tuple[str, str]:
-        self._prune_expired()
-        session = self._sessions.get(user_id)
-        if session is None or session.version != version:
-            raise KeyError("session expired")
-        return session.url, session.platform_key
+            return None
+        return session
+
+    def get_for_enqueue(
+        self, *, user_id: int, version: int, choice_id: str
+    ) -> tuple[FormatChoice, str, Platform] | None:
+        """
+        (choice, url, platform) from a single session lookup.
+        None if the session expired or the choice is unknown (no KeyError on the hot path).
+        """
+        session = self._live_session(user_id, version)
+        if session is None:
+            return None
+        choice = session.choices.get(choice_id)
+        if choice is None:
+            return None
+        return choice, session.url, session.platform
 
     def warned_risky_once(self, *, user_id: int, version: int) -> bool:
         self._prune_expired()
@@ -16,6 +16,10 @@ class _HandleState:
     loop_task: asyncio.Task[None] | None = None
     loop_stop: asyncio.Event = field(default_factory=asyncio.Event)
     last_edit_mono: float = 0.0
+    # Text of the last markup-less edit; None when unknown or a keyboard was attached.
+    last_text: str | None = None
+    pending_text: str | None = None
+    flush_task: asyncio.Task[None] | None = None
 
 
 class StatusAnimator(StatusAnimatorPort):
@@ -41,6 +45,9 @@ class StatusAnimator(StatusAnimatorPort):
     async def stop(self) -> None:
         handles = list(self._state.keys())
         for h in handles:
+            st = self._state.get(h)
+            if st is not None and st.flush_task is not None:
+                st.flush_task.cancel()
             try:
                 await self.stop_loop(h)
             except Exception:
@@ -57,6 +64,7 @@ class StatusAnimator(StatusAnimatorPort):
         return handle
 
     async def set_text(self, handle: StatusHandle, text: str, *, reply_markup: Any | None = None) -> None:
+        self._drop_pending(handle)
         try:
             await self._edit_throttled(handle, text, reply_markup=reply_markup, min_interval_sec=self._min_interval)
         except TelegramSenderMessageNotFoundError:
@@ -64,10 +72,25 @@ class StatusAnimator(StatusAnimatorPort):
             self._state.pop(handle, None)
             return
 
+    def set_next_nowait(self, handle: StatusHandle, text: str) -> None:
+        """Schedule a transient status edit without waiting for the Bot API round-trip.
+
+        Consecutive calls coalesce: only the latest text is sent. Any later
+        set_text/start_loop/finish/fail supersedes a not-yet-sent text.
+        """
+        st = self._state.setdefault(handle, _HandleState())
+        st.pending_text = text
+        if st.flush_task is None or st.flush_task.done():
+            st.flush_task = asyncio.create_task(
+                self._flush_pending(handle),
+                name=f"status_flush:{handle.chat_id}:{handle.message_id}",
+            )
+
     async def start_loop(self, handle: StatusHandle, *, frames: Sequence[str]) -> None:
         frames_t = tuple(frames)
         if not frames_t:
             return
+        self._drop_pending(handle)
         await self.stop_loop(handle)
 
         st = self._state.setdefault(handle, _HandleState())
@@ -104,8 +127,11 @@ class StatusAnimator(StatusAnimatorPort):
         st = self._state.setdefault(handle, _HandleState())
         while not st.loop_stop.is_set():
             try:
-                await self._edit_throttled(handle, frames[idx], reply_markup=None, min_interval_sec=self._loop_interval)
+                sent = await self._edit_throttled(handle, frames[idx], reply_markup=None, min_interval_sec=self._loop_interval)
                 idx = (idx + 1) % len(frames)
+                if not sent:
+                    # Frame already shown (e.g. single-frame loop): keep the loop paced.
+                    await asyncio.sleep(self._loop_interval)
             except asyncio.CancelledError:
                 return
             except TelegramSenderMessageNotFoundError:
@@ -120,17 +146,62 @@ class StatusAnimator(StatusAnimatorPort):
                 )
                 await asyncio.sleep(max(0.5, self._loop_interval))
 
-    async def _edit_throttled(self, handle: StatusHandle, text: str, *, reply_markup: Any | None, min_interval_sec: float) -> None:
+    def _drop_pending(self, handle: StatusHandle) -> None:
+        st = self._state.get(handle)
+        if st is not None:
+            st.pending_text = None
+
+    async def _flush_pending(self, handle: StatusHandle) -> None:
+        st = self._state.get(handle)
+        if st is None:
+            return
+        try:
+            # set_next_nowait only stores text while this task is alive, so keep draining until
+            # nothing new arrived during the (throttled) edit. The lock is released between edits
+            # so an explicit set_text queued behind us keeps its turn.
+            while True:
+                async with st.lock:
+                    # Read under the lock so a newer explicit edit that got here first wins.
+                    text = st.pending_text
+                    st.pending_text = None
+                    if text is None:
+                        return
+                    await self._edit_locked(st, handle, text, reply_markup=None, min_interval_sec=self._min_interval)
+        except asyncio.CancelledError:
+            return
+        except TelegramSenderMessageNotFoundError:
+            self._state.pop(handle, None)
+        except Exception:
+            self._logger.exception("status flush failed: chat_id=%s message_id=%s", handle.chat_id, handle.message_id)
+
+    async def _edit_throttled(self, handle: StatusHandle, text: str, *, reply_markup: Any | None, min_interval_sec: float) -> bool:
         st = self._state.setdefault(handle, _HandleState())
         async with st.lock:
-            now = time.monotonic()
-            delta = now - st.last_edit_mono
-            if delta < min_interval_sec:
-                await asyncio.sleep(min_interval_sec - delta)
-            await self._sender.edit_status(
-                handle.chat_id,
-                handle.message_id,
-                text,
-                reply_markup=reply_markup,
-            )
-            st.last_edit_mono = time.monotonic()
+            return await self._edit_locked(st, handle, text, reply_markup=reply_markup, min_interval_sec=min_interval_sec)
+
+    async def _edit_locked(
+        self,
+        st: _HandleState,
+        handle: StatusHandle,
+        text: str,
+        *,
+        reply_markup: Any | None,
+        min_interval_sec: float,
+    ) -> bool:
+        """Returns False if the edit was skipped as a no-op."""
+        if reply_markup is None and text == st.last_text:
+            # Same text already on screen: no Bot API call, no throttle wait.
+            return False
+        now = time.monotonic()
+        delta = now - st.last_edit_mono
+        if delta < min_interval_sec:
+            await asyncio.sleep(min_interval_sec - delta)
+        await self._sender.edit_status(
+            handle.chat_id,
+            handle.message_id,
+            text,
+            reply_markup=reply_markup,
+        )
+        st.last_edit_mono = time.monotonic()
+        st.last_text = text if reply_markup is None else None
+        return True
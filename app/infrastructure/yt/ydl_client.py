@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -79,6 +80,28 @@ class YdlClient:
     def __init__(self, *, cfg: YdlConfig) -> None:
         self._cfg = cfg
         self._logger = logging.getLogger("ydl")
+        self._download_argv = self._build_download_argv(cfg)
+
+    @staticmethod
+    def _build_download_argv(cfg: YdlConfig) -> tuple[str, ...]:
+        """Config-derived yt-dlp argv prefix; YdlConfig is frozen, so it is built once per client."""
+        argv = [
+            sys.executable,
+            "-m",
+            "yt_dlp",
+            "--no-playlist",
+            "--retries",
+            str(cfg.retries),
+            "--socket-timeout",
+            str(cfg.socket_timeout_sec),
+        ]
+        if cfg.quiet:
+            argv.append("--quiet")
+        if cfg.no_warnings:
+            argv.append("--no-warnings")
+        if cfg.restrict_filenames:
+            argv.append("--restrict-filenames")
+        return tuple(argv)
 
     async def extract(self, url: str, *, extra_opts: dict[str, Any] | None = None) -> ExtractResult:
         try:
@@ -192,40 +215,24 @@ class YdlClient:
         *,
         url: str,
         extractor_format_id: str,
-        out_path: Path,
+        out_path: str | os.PathLike[str],
         cancel_event: asyncio.Event | None = None,
     ) -> Path:
-        out_path.parent.mkdir(parents=True, exist_ok=True)
+        # out_path's directory is the job workdir allocated by TempStorage (yt-dlp would
+        # create it anyway), so no makedirs per stream.
+        out = os.fspath(out_path)
+        out_dir, out_name = os.path.split(out)
 
         # yt-dlp may change extension; use template
-        outtmpl = str(out_path) + ".%(ext)s"
+        outtmpl = out + ".%(ext)s"
 
-        cmd: list[str] = [
-            sys.executable,
-            "-m",
-            "yt_dlp",
-            "--no-playlist",
-            "--retries",
-            str(self._cfg.retries),
-            "--socket-timeout",
-            str(self._cfg.socket_timeout_sec),
+        proc = await asyncio.create_subprocess_exec(
+            *self._download_argv,
             "-f",
             extractor_format_id,
             "-o",
             outtmpl,
-        ]
-
-        if self._cfg.quiet:
-            cmd.append("--quiet")
-        if self._cfg.no_warnings:
-            cmd.append("--no-warnings")
-        if self._cfg.restrict_filenames:
-            cmd.append("--restrict-filenames")
-
-        cmd.append(url)
-
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
+            url,
             stdout=PIPE,
             stderr=PIPE,
         )
@@ -272,7 +279,7 @@ class YdlClient:
                     self._cfg.download_timeout_sec,
                     url,
                     extractor_format_id,
-                    str(out_path),
+                    out,
                 )
                 raise YdlError(
                     f"Downloader timed out after {self._cfg.download_timeout_sec}s while downloading media stream"
@@ -284,6 +291,11 @@ class YdlClient:
                 raise JobCancelledError()
 
             stdout_b, stderr_b = await comm_task
+        except asyncio.CancelledError:
+            # Task cancelled by the caller (e.g. sibling stream failed): don't leave yt-dlp running.
+            comm_task.cancel()
+            await _terminate(proc)
+            raise
         finally:
             if cancel_task is not None:
                 cancel_task.cancel()
@@ -294,18 +306,19 @@ class YdlClient:
                 proc.returncode,
                 url,
                 extractor_format_id,
-                str(out_path),
+                out,
                 (stderr_b or b"").decode(errors="ignore").strip(),
             )
             raise YdlError("Failed to download stream")
 
         # Locate the produced file
-        candidates = sorted(out_path.parent.glob(out_path.name + ".*"))
+        parent = Path(out_dir)
+        candidates = sorted(parent.glob(out_name + ".*"))
         for c in candidates:
             if c.is_file() and c.stat().st_size > 0:
                 return c
 
-        candidates = sorted(out_path.parent.glob(out_path.name + "*"))
+        candidates = sorted(parent.glob(out_name + "*"))
         for c in candidates:
             if c.is_file() and c.stat().st_size > 0:
                 return c
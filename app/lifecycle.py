@@ -52,7 +52,7 @@ class AppLifecycle:
             raise LifecycleError(f"TEMP_ROOT is not writable: {s.temp_root}") from exc
 
     async def _start_components(self) -> None:
-        for name, component in self.container.all_components():
+        for name, component in self.container.managed_components():
             if isinstance(component, AsyncStartStop):
                 self._logger.info("component.start: %s", name)
                 try:
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+from typing import Sequence
+
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 from app.domain.models import FormatChoice
 from app.presentation.callback_data import FormatSelectCb
 
 
-def formats_keyboard(*, choices: list[FormatChoice], version: int) -> InlineKeyboardMarkup:
+def formats_keyboard(*, choices: Sequence[FormatChoice], version: int) -> InlineKeyboardMarkup:
     rows: list[list[InlineKeyboardButton]] = []
 
     for c in choices:
@@ -19,6 +19,7 @@ from app.constants import (
     MSG_CHOOSE_QUALITY,
 )
 from app.domain.errors import DomainError
+from app.domain.validators import has_url_scheme
 from app.presentation.keyboards.formats import formats_keyboard
 
 router = Router()
@@ -33,7 +34,7 @@ _URL_RX = re.compile(
 
 def _normalize_url(url: str) -> str:
     url = url.strip().rstrip(").,;:!?]}>\"'“”»")
-    if url.startswith("http://") or url.startswith("https://"):
+    if has_url_scheme(url):
         return url
     return "https://" + url
 
@@ -102,29 +103,33 @@ async def link_handler(
     if message.text and message.text.startswith("/"):
         return
 
-    logger.debug(
-        "link_handler hit: text=%r caption=%r entities=%s caption_entities=%s reply_has=%s",
-        message.text,
-        message.caption,
-        getattr(message, "entities", None),
-        getattr(message, "caption_entities", None),
-        bool(message.reply_to_message),
-    )
-
-    url = _extract_url(message)
-    logger.debug("extracted url=%r", url)
-
-    if not url:
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
         logger.debug(
-            "URL not detected. text=%r caption=%r entities=%s caption_entities=%s reply_has=%s reply_text=%r reply_caption=%r",
+            "link_handler hit: text=%r caption=%r entities=%s caption_entities=%s reply_has=%s",
             message.text,
             message.caption,
             getattr(message, "entities", None),
             getattr(message, "caption_entities", None),
             bool(message.reply_to_message),
-            (message.reply_to_message.text if message.reply_to_message else None),
-            (message.reply_to_message.caption if message.reply_to_message else None),
         )
+
+    url = _extract_url(message)
+    if debug:
+        logger.debug("extracted url=%r", url)
+
+    if not url:
+        if debug:
+            logger.debug(
+                "URL not detected. text=%r caption=%r entities=%s caption_entities=%s reply_has=%s reply_text=%r reply_caption=%r",
+                message.text,
+                message.caption,
+                getattr(message, "entities", None),
+                getattr(message, "caption_entities", None),
+                bool(message.reply_to_message),
+                (message.reply_to_message.text if message.reply_to_message else None),
+                (message.reply_to_message.caption if message.reply_to_message else None),
+            )
         await message.answer(UX_PROMPT_SEND_LINK)
         return
 
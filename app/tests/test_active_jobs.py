@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.infrastructure import active_jobs
+from app.infrastructure.active_jobs import ActiveJobsRegistry
+
+_TTL = 100
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> _Clock:
+    c = _Clock()
+    monkeypatch.setattr(active_jobs, "time", SimpleNamespace(monotonic=c.monotonic))
+    return c
+
+
+def test_stale_counter_expires(clock: _Clock) -> None:
+    reg = ActiveJobsRegistry(max_active_per_user=1, stale_ttl_sec=_TTL)
+    assert reg.try_acquire(1)
+    assert not reg.try_acquire(1)
+
+    clock.now = _TTL + 1
+    assert reg.try_acquire(1)
+
+
+def test_retouched_counter_outlives_its_first_expiry(clock: _Clock) -> None:
+    reg = ActiveJobsRegistry(max_active_per_user=2, stale_ttl_sec=_TTL)
+    assert reg.try_acquire(1)
+    clock.now = 50
+    assert reg.try_acquire(1)
+
+    # The first touch's heap entry surfaces, but the counter was touched again since.
+    clock.now = _TTL + 1
+    assert not reg.try_acquire(1)
+
+    clock.now = 50 + _TTL + 1
+    assert reg.try_acquire(1)
+
+
+def test_outdated_entry_from_before_release_does_not_evict_reacquired_slot(clock: _Clock) -> None:
+    reg = ActiveJobsRegistry(max_active_per_user=1, stale_ttl_sec=_TTL)
+    assert reg.try_acquire(1)
+    clock.now = 10
+    reg.release(1)
+    clock.now = 20
+    assert reg.try_acquire(1)
+
+    clock.now = _TTL + 1
+    assert not reg.try_acquire(1)
+
+    clock.now = 20 + _TTL + 1
+    assert reg.try_acquire(1)
+
+
+def test_expiry_only_touches_its_own_user(clock: _Clock) -> None:
+    reg = ActiveJobsRegistry(max_active_per_user=1, stale_ttl_sec=_TTL)
+    assert reg.try_acquire(1)
+    clock.now = 50
+    assert reg.try_acquire(2)
+
+    clock.now = _TTL + 1
+    assert reg.try_acquire(1)
+    assert not reg.try_acquire(2)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, cast
+
+import pytest
+
+from app import lifecycle
+from app.config import Settings
+from app.di import Container
+from app.lifecycle import AppLifecycle
+
+
+class _Managed:
+    def __init__(self, events: list[str], name: str, *deps: Any) -> None:
+        self._events = events
+        self._name = name
+        self.deps = deps
+
+    async def start(self) -> None:
+        self._events.append(f"start:{self._name}")
+
+    async def stop(self) -> None:
+        self._events.append(f"stop:{self._name}")
+
+
+def _container(temp_root: Path) -> Container:
+    settings = cast(Settings, SimpleNamespace(temp_root=temp_root))
+    return Container(settings=settings, logger=logging.getLogger("test"), _components={}, _factories={}, _managed=[])
+
+
+def _register(container: Container, built: list[str], events: list[str]) -> None:
+    get = container.get
+
+    def factory(name: str, make: Any) -> Any:
+        def build() -> Any:
+            component = make()
+            built.append(name)
+            return component
+
+        return build
+
+    container.register_factory("storage", factory("storage", lambda: _Managed(events, "storage")), managed=True)
+    container.register_factory("sender", factory("sender", object))
+    container.register_factory(
+        "queue",
+        factory("queue", lambda: _Managed(events, "queue", get("storage"), get("sender"))),
+        managed=True,
+    )
+    container.register_factory("use_case", factory("use_case", object))
+
+
+def test_managed_components_builds_only_managed_and_their_deps(tmp_path: Path) -> None:
+    built: list[str] = []
+    container = _container(tmp_path)
+    _register(container, built, [])
+
+    names = [name for name, _ in container.managed_components()]
+
+    assert names == ["storage", "queue"]
+    assert "use_case" not in built
+    assert built.index("sender") < built.index("queue")
+
+
+def test_startup_leaves_non_managed_factories_unbuilt(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    built: list[str] = []
+    events: list[str] = []
+    container = _container(tmp_path)
+    monkeypatch.setattr(lifecycle, "build_di_graph", lambda c: _register(c, built, events))
+    app = AppLifecycle(container=container)
+
+    async def scenario() -> None:
+        await app.startup()
+        assert "use_case" not in built
+        await app.shutdown()
+
+    asyncio.run(scenario())
+
+    assert "use_case" not in built
+    assert events == ["start:storage", "start:queue", "stop:queue", "stop:storage"]
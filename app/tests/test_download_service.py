@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+from app.application.services import _PROBE_OVERLAP_FROM_BYTES, DownloadService
+from app.infrastructure.ffmpeg import ProbeResult
+from app.infrastructure.telegram_sender import TelegramSenderError
+from app.infrastructure.yt import YdlError
+
+_BIG = _PROBE_OVERLAP_FROM_BYTES
+
+
+class _FakeAnimator:
+    def set_next_nowait(self, handle: Any, text: str) -> None:
+        return
+
+    async def start_loop(self, handle: Any, *, frames: Any) -> None:
+        return
+
+
+class _FakeSender:
+    def __init__(self, *, upload_sec: float) -> None:
+        self.sent: list[Path] = []
+        self.cancelled = False
+        self._upload_sec = upload_sec
+
+    async def send_media_best_effort(self, chat_id: int, file_path: Path) -> None:
+        try:
+            await asyncio.sleep(self._upload_sec)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        self.sent.append(file_path)
+
+
+class _FakeProbe:
+    def __init__(self, *, probe_sec: float, has_audio: bool) -> None:
+        self._probe_sec = probe_sec
+        self._has_audio = has_audio
+
+    async def probe(self, file_path: Path, *, cancel_event: asyncio.Event | None = None) -> ProbeResult:
+        await asyncio.sleep(self._probe_sec)
+        return ProbeResult(
+            has_video=True,
+            has_audio=self._has_audio,
+            duration_sec=10.0,
+            size_bytes=_BIG,
+            format_name=None,
+        )
+
+
+class _FakeYdl:
+    """Video stream fails fast; audio stream runs until cancelled."""
+
+    def __init__(self) -> None:
+        self.audio_cancelled = False
+
+    async def download_stream(
+        self,
+        *,
+        url: str,
+        extractor_format_id: str,
+        out_path: str,
+        cancel_event: asyncio.Event,
+    ) -> Path:
+        if extractor_format_id == "v":
+            await asyncio.sleep(0.01)
+            raise YdlError("video stream failed")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.audio_cancelled = True
+            raise
+        return Path(out_path)
+
+
+def _service(**overrides: Any) -> DownloadService:
+    deps: dict[str, Any] = dict(
+        temp_storage=None,
+        ydl=None,
+        ffmpeg=None,
+        ffprobe=None,
+        telegram_sender=None,
+        status_animator=_FakeAnimator(),
+        active_jobs=None,
+        tg_hard_limit_bytes=2 * 1024**3,
+    )
+    deps.update(overrides)
+    return DownloadService(**deps)
+
+
+def _probe_and_send(svc: DownloadService) -> str | None:
+    return asyncio.run(
+        svc._probe_and_send(
+            handle=cast(Any, None),
+            chat_id=1,
+            path=Path("output.mp4"),
+            size=_BIG,
+            cancel_event=asyncio.Event(),
+        )
+    )
+
+
+def test_big_file_rejected_mid_upload_cancels_the_upload() -> None:
+    sender = _FakeSender(upload_sec=0.2)
+    svc = _service(telegram_sender=sender, ffprobe=_FakeProbe(probe_sec=0.01, has_audio=False))
+
+    with pytest.raises(TelegramSenderError):
+        _probe_and_send(svc)
+
+    assert sender.cancelled
+    assert sender.sent == []
+
+
+def test_big_file_rejected_after_upload_reports_delivery() -> None:
+    sender = _FakeSender(upload_sec=0.01)
+    svc = _service(telegram_sender=sender, ffprobe=_FakeProbe(probe_sec=0.05, has_audio=False))
+
+    reason = _probe_and_send(svc)
+
+    assert reason == "Файл повреждён (нет видео/аудио)."
+    assert sender.sent == [Path("output.mp4")]
+
+
+def test_big_file_validated_is_sent() -> None:
+    sender = _FakeSender(upload_sec=0.01)
+    svc = _service(telegram_sender=sender, ffprobe=_FakeProbe(probe_sec=0.01, has_audio=True))
+
+    assert _probe_and_send(svc) is None
+    assert sender.sent == [Path("output.mp4")]
+
+
+def test_split_download_failure_cancels_sibling_stream() -> None:
+    ydl = _FakeYdl()
+    svc = _service(ydl=ydl)
+
+    async def scenario() -> bool:
+        with pytest.raises(YdlError):
+            await svc._handle_split_download(
+                url="https://example.com/v",
+                video_fmt_id="v",
+                audio_fmt_id="a",
+                workdir="/nonexistent",
+                cancel_event=asyncio.Event(),
+            )
+        # Checked before asyncio.run() tears down the loop and cancels leftovers itself.
+        return ydl.audio_cancelled
+
+    assert asyncio.run(scenario())
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, cast
+
+from app.infrastructure.status_animator import StatusAnimator
+
+if TYPE_CHECKING:
+    from app.infrastructure.telegram_sender import TelegramSender
+
+
+class _FakeSender:
+    def __init__(self, *, edit_delay_sec: float) -> None:
+        self.edits: list[str] = []
+        self._edit_delay_sec = edit_delay_sec
+
+    async def edit_status(self, chat_id: int, message_id: int, text: str, *, reply_markup: Any | None = None) -> None:
+        # Simulates the Bot API round-trip, so later set_next_nowait calls land mid-edit.
+        await asyncio.sleep(self._edit_delay_sec)
+        self.edits.append(text)
+
+
+def test_set_next_nowait_delivers_text_coalesced_during_inflight_edit() -> None:
+    async def scenario() -> list[str]:
+        sender = _FakeSender(edit_delay_sec=0.02)
+        anim = StatusAnimator(sender=cast("TelegramSender", sender), min_edit_interval_sec=0.05)
+        handle = anim.attach(chat_id=1, message_id=2)
+
+        anim.set_next_nowait(handle, "merge")
+        await asyncio.sleep(0.005)  # first edit is now in flight
+        anim.set_next_nowait(handle, "validate")
+        anim.set_next_nowait(handle, "probe")
+
+        await asyncio.sleep(0.3)
+        await anim.stop()
+        return sender.edits
+
+    assert asyncio.run(scenario()) == ["merge", "probe"]
+
+
+def test_set_text_supersedes_pending_nowait_text() -> None:
+    async def scenario() -> list[str]:
+        sender = _FakeSender(edit_delay_sec=0.0)
+        anim = StatusAnimator(sender=cast("TelegramSender", sender), min_edit_interval_sec=0.05)
+        handle = anim.attach(chat_id=1, message_id=2)
+
+        anim.set_next_nowait(handle, "probe")
+        await anim.set_text(handle, "done")
+
+        await asyncio.sleep(0.1)
+        await anim.stop()
+        return sender.edits
+
+    assert asyncio.run(scenario()) == ["done"]